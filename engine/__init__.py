@@ -0,0 +1,2 @@
+"""Data engine behind the Streamlit app: everything here is plain pandas/numpy
+and can be imported and tested outside a Streamlit rerun."""
@@ -0,0 +1,184 @@
+"""Batch pipeline: distance from every municipality to its nearest schools.
+
+``centros_por_1000hab`` is a count ratio; this adds how far residents
+actually are from a school. For each municipality centroid we keep the
+distance to the nearest school and the mean over the ``k`` nearest:
+
+    python -m engine.accessibility --k 3 --processes 4
+    python -m engine.accessibility --graph-nodes nodes.csv --graph-edges edges.csv
+
+Straight-line (haversine) distances are computed in vectorized chunks,
+spread over a process pool. With a local road graph (nodes ``id,lat,lon``,
+edges ``u,v,length_m``) a single multi-source Dijkstra gives road distances
+for every municipality at once. The result is written to
+``data/accesibilidad_municipios.csv`` and merged into the indicator table
+when the dataset is loaded.
+"""
+import argparse
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from engine.geo import normalize_lat
+
+ACCESIBILIDAD_CSV = "data/accesibilidad_municipios.csv"
+COLUMNAS = ["dist_centro_km", "dist_media_centros_km"]
+EARTH_RADIUS_KM = 6371.0088
+CHUNK = 256
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Pairwise distances, shape (len(lat1), len(lat2))."""
+    lat1, lon1 = np.radians(lat1)[:, None], np.radians(lon1)[:, None]
+    lat2, lon2 = np.radians(lat2)[None, :], np.radians(lon2)[None, :]
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def nearest_k(lat, lon, ref_lat, ref_lon, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Distances (km, ascending) and indices of the ``k`` nearest reference points.
+
+    Works in chunks of rows so memory stays at CHUNK x len(ref).
+    """
+    k = min(k, len(ref_lat))
+    dist = np.empty((len(lat), k))
+    idx = np.empty((len(lat), k), dtype=np.int64)
+    for start in range(0, len(lat), CHUNK):
+        d = haversine_km(lat[start:start + CHUNK], lon[start:start + CHUNK], ref_lat, ref_lon)
+        part = np.argpartition(d, k - 1, axis=1)[:, :k]
+        pd_ = np.take_along_axis(d, part, axis=1)
+        order = np.argsort(pd_, axis=1)
+        dist[start:start + CHUNK] = np.take_along_axis(pd_, order, axis=1)
+        idx[start:start + CHUNK] = np.take_along_axis(part, order, axis=1)
+    return dist, idx
+
+
+_SCHOOLS = None
+
+
+def _init_worker(sch_lat, sch_lon):
+    global _SCHOOLS
+    _SCHOOLS = (sch_lat, sch_lon)
+
+
+def _worker(args):
+    lat, lon, k = args
+    return nearest_k(lat, lon, *_SCHOOLS, k)[0]
+
+
+def haversine_nearest(lat, lon, sch_lat, sch_lon, k: int, processes: int | None = 1) -> np.ndarray:
+    if processes == 1 or len(lat) <= CHUNK:
+        return nearest_k(lat, lon, sch_lat, sch_lon, k)[0]
+    partes = [(lat[i:i + CHUNK], lon[i:i + CHUNK], k) for i in range(0, len(lat), CHUNK)]
+    # the school arrays travel once per worker, not once per chunk
+    with ProcessPoolExecutor(processes, initializer=_init_worker,
+                             initargs=(sch_lat, sch_lon)) as pool:
+        return np.vstack(list(pool.map(_worker, partes)))
+
+
+class RoadGraph:
+    """Undirected road network loaded from local node/edge CSVs."""
+
+    def __init__(self, nodes: pd.DataFrame, edges: pd.DataFrame):
+        self.ids = nodes["id"].to_numpy()
+        self.lat = nodes["lat"].to_numpy(dtype=float)
+        self.lon = nodes["lon"].to_numpy(dtype=float)
+        pos = {n: i for i, n in enumerate(self.ids)}
+        self.adj = [[] for _ in range(len(self.ids))]
+        for u, v, w in edges[["u", "v", "length_m"]].itertuples(index=False):
+            if u in pos and v in pos:
+                self.adj[pos[u]].append((pos[v], w / 1000))
+                self.adj[pos[v]].append((pos[u], w / 1000))
+
+    @classmethod
+    def from_csv(cls, nodes_csv: str, edges_csv: str) -> "RoadGraph":
+        return cls(pd.read_csv(nodes_csv), pd.read_csv(edges_csv))
+
+    def snap(self, lat, lon) -> tuple[np.ndarray, np.ndarray]:
+        """Nearest graph node and the straight-line distance to it (km)."""
+        dist, idx = nearest_k(lat, lon, self.lat, self.lon, 1)
+        return idx[:, 0], dist[:, 0]
+
+    def k_nearest_sources(self, sources, offsets, k: int) -> list[list[float]]:
+        """Multi-source Dijkstra keeping up to ``k`` distinct sources per node."""
+        labels = [[] for _ in self.adj]
+        seen = [set() for _ in self.adj]
+        heap = [(off, node, s) for s, (node, off) in enumerate(zip(sources, offsets))]
+        heapq.heapify(heap)
+        while heap:
+            d, node, s = heapq.heappop(heap)
+            if len(labels[node]) >= k or s in seen[node]:
+                continue
+            labels[node].append(d)
+            seen[node].add(s)
+            for nxt, w in self.adj[node]:
+                if len(labels[nxt]) < k and s not in seen[nxt]:
+                    heapq.heappush(heap, (d + w, nxt, s))
+        return labels
+
+
+def road_nearest(lat, lon, sch_lat, sch_lon, k: int, graph: RoadGraph) -> np.ndarray:
+    sch_node, sch_off = graph.snap(sch_lat, sch_lon)
+    mun_node, mun_off = graph.snap(lat, lon)
+    labels = graph.k_nearest_sources(sch_node, sch_off, k)
+    dist = np.full((len(lat), k), np.nan)
+    for i, (node, off) in enumerate(zip(mun_node, mun_off)):
+        d = labels[node]
+        dist[i, :len(d)] = np.asarray(d) + off
+    return dist
+
+
+def compute_accessibility(df: pd.DataFrame, centros_df: pd.DataFrame, k: int = 3,
+                          processes: int | None = 1, graph: RoadGraph | None = None) -> pd.DataFrame:
+    mun = df.dropna(subset=["lat", "lon"])
+    lat, lon = normalize_lat(mun["lat"]), mun["lon"].to_numpy(dtype=float)
+    centros = centros_df.dropna(subset=["LATITUD", "LONGITUD"])
+    sch_lat = centros["LATITUD"].to_numpy(dtype=float)
+    sch_lon = centros["LONGITUD"].to_numpy(dtype=float)
+
+    if graph is None:
+        dist = haversine_nearest(lat, lon, sch_lat, sch_lon, k, processes)
+    else:
+        dist = road_nearest(lat, lon, sch_lat, sch_lon, k, graph)
+
+    return pd.DataFrame({
+        "municipio": mun["municipio"].to_numpy(),
+        "dist_centro_km": dist[:, 0].round(3),
+        "dist_media_centros_km": np.nanmean(dist, axis=1).round(3)})
+
+
+def merge_accessibility(df: pd.DataFrame, acc: pd.DataFrame | None) -> pd.DataFrame:
+    if acc is None:
+        return df
+    return df.merge(acc[["municipio"] + COLUMNAS], on="municipio", how="left")
+
+
+def main():
+    from engine.refresh import CENTROS_CSV, INDICADORES_CSV
+
+    parser = argparse.ArgumentParser(description="Distance from municipalities to their nearest schools.")
+    parser.add_argument("--k", type=int, default=3, help="schools averaged in dist_media_centros_km")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--graph-nodes", help="road graph nodes CSV (id,lat,lon)")
+    parser.add_argument("--graph-edges", help="road graph edges CSV (u,v,length_m)")
+    parser.add_argument("--out", default=ACCESIBILIDAD_CSV)
+    args = parser.parse_args()
+
+    graph = None
+    if args.graph_nodes or args.graph_edges:
+        if not (args.graph_nodes and args.graph_edges):
+            parser.error("--graph-nodes and --graph-edges go together")
+        graph = RoadGraph.from_csv(args.graph_nodes, args.graph_edges)
+
+    acc = compute_accessibility(pd.read_csv(INDICADORES_CSV), pd.read_csv(CENTROS_CSV),
+                                args.k, args.processes, graph)
+    acc.to_csv(args.out, index=False)
+    print(f"{len(acc)} municipalities -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
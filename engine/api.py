@@ -0,0 +1,226 @@
+"""Headless HTTP API over the same in-memory dataset the app serves.
+
+    GET  /version
+    GET  /search?min_centros=1&min_viviendas=1&min_empresas=100[&max_dist_km=2]
+    GET  /compare?municipio=ador&municipio=ademuz
+    GET  /schools?regimen=púb.
+    GET  /similar?municipio=ador&k=5
+    POST /batch      [{"query": "search", "params": {...}}, ...]
+
+Responses are JSON; tabular endpoints return Arrow IPC streams with
+``?format=arrow`` (needs ``pyarrow``). Run standalone with
+``python -m engine.api --port 8765`` or inside the Streamlit process with
+``EDM_API_PORT=8765`` so it shares the app's ``DatasetStore``.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from engine.resultcache import cached_compare, cached_schools, cached_search
+
+log = logging.getLogger(__name__)
+
+MAX_BODY = 1024 * 1024
+MAX_BATCH = 100
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _records(frame: pd.DataFrame) -> list:
+    # to_json turns NaN into null, which json.dumps would not
+    return json.loads(frame.to_json(orient="records", force_ascii=False))
+
+
+def _float(params: dict, name: str, default: float | None) -> float | None:
+    if params.get(name) is None:
+        return default
+    try:
+        valor = float(params[name])
+    except (TypeError, ValueError):
+        raise BadRequest(f"{name} must be a number")
+    if math.isnan(valor):
+        raise BadRequest(f"{name} must be a number")
+    return valor
+
+
+def _count(params: dict, name: str, default: int) -> int:
+    valor = _float(params, name, default)
+    if not math.isfinite(valor) or valor < 1:
+        raise BadRequest(f"{name} must be a positive integer")
+    return int(valor)
+
+
+def _names(params: dict, name: str) -> list[str]:
+    valor = params.get(name) or []
+    if isinstance(valor, str):
+        valor = [valor]
+    if not isinstance(valor, list) or not all(isinstance(v, str) for v in valor):
+        raise BadRequest(f"{name} must be a string or a list of strings")
+    return valor
+
+
+def run_query(dataset, query: str, params: dict):
+    """Returns a DataFrame (tabular answers) or a JSON-ready dict."""
+    if query == "search":
+        return cached_search(dataset,
+                             _float(params, "min_centros", 1.0),
+                             _float(params, "min_viviendas", 1.0),
+                             _float(params, "min_empresas", 100.0),
+                             _float(params, "max_dist_km", None))
+    if query == "compare":
+        res = cached_compare(dataset, _names(params, "municipio"))
+        return {
+            "indicadores": _records(res["indicadores"]),
+            "normalizado": _records(res["normalizado"].reset_index()),
+            "normalizado_global": _records(res["normalizado_global"].reset_index()),
+            "mejor": res["mejor"],
+            "pequenos": res["pequenos"]}
+    if query == "schools":
+        regimen = params.get("regimen")
+        if not isinstance(regimen, str) or regimen not in dataset.marcadores:
+            raise BadRequest(f"unknown regimen, expected one of {sorted(dataset.marcadores)}")
+        return cached_schools(dataset, regimen)
+    if query == "similar":
+        municipio = (_names(params, "municipio") or [None])[0]
+        if municipio not in dataset.vecinos.posicion:
+            raise BadRequest("unknown municipio")
+        return dataset.vecinos.query(municipio, _count(params, "k", 5))
+    raise BadRequest(f"unknown query {query!r}")
+
+
+def _arrow(frame: pd.DataFrame) -> bytes:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def handle(store, method: str, target: str, body: bytes) -> tuple[int, str, bytes]:
+    url = urlsplit(target)
+    params = {k: (v if len(v) > 1 or k == "municipio" else v[0])
+              for k, v in parse_qs(url.query).items()}
+    # one version for the whole request, even if a refresh lands meanwhile
+    dataset = store.current()
+    path = url.path.rstrip("/")
+
+    if method == "GET" and path == "/version":
+        return 200, "application/json", json.dumps({"version": dataset.version}).encode()
+
+    if method == "POST" and path == "/batch":
+        try:
+            consultas = json.loads(body or b"[]")
+        except ValueError:
+            raise BadRequest("body must be a JSON list")
+        if not isinstance(consultas, list) or len(consultas) > MAX_BATCH:
+            raise BadRequest(f"body must be a JSON list of at most {MAX_BATCH} queries")
+        resultados = []
+        for c in consultas:
+            try:
+                if not isinstance(c, dict):
+                    raise BadRequest("each query must be a JSON object")
+                item = c.get("params") or {}
+                if not isinstance(item, dict):
+                    raise BadRequest("params must be a JSON object")
+                res = run_query(dataset, c.get("query"), item)
+                resultados.append(_records(res) if isinstance(res, pd.DataFrame) else res)
+            except (BadRequest, ValueError) as e:
+                # one bad item must not fail the whole batch
+                resultados.append({"error": str(e)})
+        payload = {"version": dataset.version, "results": resultados}
+        return 200, "application/json", json.dumps(payload, ensure_ascii=False).encode()
+
+    if method == "GET" and path in ("/search", "/compare", "/schools", "/similar"):
+        res = run_query(dataset, path[1:], params)
+        if params.get("format") == "arrow":
+            if not isinstance(res, pd.DataFrame):
+                raise BadRequest("format=arrow is only available for tabular queries")
+            return 200, "application/vnd.apache.arrow.stream", _arrow(res)
+        data = _records(res) if isinstance(res, pd.DataFrame) else res
+        payload = {"version": dataset.version, "data": data}
+        return 200, "application/json", json.dumps(payload, ensure_ascii=False).encode()
+
+    return 404, "application/json", b'{"error": "not found"}'
+
+
+async def _serve_client(store, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        if len(request_line) < 2:
+            return
+        method, target = request_line[0], request_line[1]
+        try:
+            try:
+                length = int(headers.get("content-length", 0) or 0)
+            except ValueError:
+                raise BadRequest("invalid Content-Length")
+            if length < 0:
+                raise BadRequest("invalid Content-Length")
+            if length > MAX_BODY:
+                raise BadRequest("body too large")
+            body = await reader.readexactly(length) if length else b""
+            # queries are CPU-bound pandas work: keep the event loop responsive
+            status, ctype, payload = await asyncio.to_thread(handle, store, method, target, body)
+        except BadRequest as e:
+            status, ctype, payload = 400, "application/json", json.dumps({"error": str(e)}).encode()
+        except ImportError:
+            status, ctype, payload = 406, "application/json", b'{"error": "pyarrow is not installed"}'
+        except Exception:
+            log.exception("API request failed: %s %s", method, target)
+            status, ctype, payload = 500, "application/json", b'{"error": "internal error"}'
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                  406: "Not Acceptable", 500: "Internal Server Error"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {ctype}\r\n"
+                     f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode())
+        writer.write(payload)
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(store, host: str = "127.0.0.1", port: int = 8765):
+    server = await asyncio.start_server(
+        lambda r, w: _serve_client(store, r, w), host, port)
+    log.info("API listening on %s:%s", host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def start_in_thread(store, host: str = "127.0.0.1", port: int = 8765) -> threading.Thread:
+    """Run the API next to the Streamlit app, sharing its ``DatasetStore``."""
+    t = threading.Thread(target=asyncio.run, args=(serve(store, host, port),),
+                         name="edm-api", daemon=True)
+    t.start()
+    return t
+
+
+def main():
+    from engine.refresh import DatasetStore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(DatasetStore().start(), args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
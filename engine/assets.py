@@ -0,0 +1,122 @@
+"""Static asset pipeline for a fast first paint.
+
+    python -m engine.assets [--fonts-dir assets/fonts]
+
+* responsive variants of the HOME image (WebP and, when Pillow supports
+  it, AVIF) at several widths under ``static/img``;
+* subsetted WOFF2 copies of Inter, Poppins and the Font Awesome solid font
+  under ``static/fonts``, containing only the glyphs the app shows. The
+  subsets are committed (with their OFL / Font Awesome Free licences), so
+  the app needs no network; rebuild them only when the glyph sets change.
+  Source fonts are read from a local directory: Inter 3.x static WOFF2
+  (Inter-Regular, Inter-Medium), Poppins-Regular/SemiBold.ttf (PyPI
+  ``fontpkg-poppins``) and fa-solid-900.ttf (PyPI ``fontawesomefree``).
+
+Everything is served by Streamlit's static file server (see
+``.streamlit/config.toml``) and referenced from ``static/styles.css``.
+Pillow and fontTools are only needed to run the build, not the app.
+"""
+import argparse
+import glob
+import os
+
+STATIC_DIR = "static"
+IMAGENES = {"collage": "collage.png"}
+ANCHOS = (480, 768, 1080)
+CALIDAD = {"webp": 80, "avif": 60}
+# (source file stem, output name, glyph set)
+FUENTES = [
+    ("Inter-Regular", "inter-400", "texto"),
+    ("Inter-Medium", "inter-500", "texto"),
+    ("Poppins-Regular", "poppins-400", "texto"),
+    ("Poppins-SemiBold", "poppins-600", "texto"),
+    ("fa-solid-900", "fa-solid-900", "iconos")]
+
+# Basic Latin, Latin-1 (Valencian/Spanish accents, middle dot) and punctuation
+TEXTO = "U+0020-007E,U+00A0-00FF,U+0152-0153,U+2013-2014,U+2018-201E,U+2022,U+2026,U+20AC"
+# icons used in the page plus the tab pseudo-icons in styles.css
+ICONOS = ("U+F002,U+F005,U+F05A,U+F0B1,U+F121,U+F19D,U+F200,U+F201,U+F46D,"
+          "U+F543,U+F549,U+F5A0,U+F7F2,U+E0E3,U+E3AF")
+
+
+def _variantes(nombre: str) -> dict[str, list[tuple[int, str]]]:
+    """format -> [(width, url)] of the variants already built."""
+    found = {}
+    for path in glob.glob(os.path.join(STATIC_DIR, "img", f"{nombre}-*.*")):
+        base, ext = os.path.splitext(os.path.basename(path))
+        ancho = base.rsplit("-", 1)[1]
+        if ancho.isdigit():
+            found.setdefault(ext[1:], []).append((int(ancho), f"app/static/img/{os.path.basename(path)}"))
+    return {fmt: sorted(v) for fmt, v in found.items()}
+
+
+def picture_html(nombre: str, alt: str = "", sizes: str = "(max-width: 1400px) 100vw, 1400px") -> str:
+    """``<picture>`` with every built variant, or "" if the pipeline has not run."""
+    variantes = _variantes(nombre)
+    if "webp" not in variantes:
+        return ""
+    sources = []
+    for fmt in ("avif", "webp"):
+        if fmt in variantes:
+            srcset = ", ".join(f"{url} {w}w" for w, url in variantes[fmt])
+            sources.append(f'<source type="image/{fmt}" srcset="{srcset}" sizes="{sizes}">')
+    _, url = variantes["webp"][-1]
+    return (f'<picture>{"".join(sources)}'
+            f'<img class="hero" src="{url}" alt="{alt}" decoding="async"></picture>')
+
+
+def build_images(out_dir: str = os.path.join(STATIC_DIR, "img")):
+    from PIL import Image, features
+
+    os.makedirs(out_dir, exist_ok=True)
+    formatos = [f for f in ("webp", "avif") if features.check(f)]
+    for nombre, origen in IMAGENES.items():
+        with Image.open(origen) as im:
+            im = im.convert("RGB")
+            for ancho in ANCHOS:
+                if ancho > im.width:
+                    continue
+                alto = round(im.height * ancho / im.width)
+                variante = im.resize((ancho, alto), Image.LANCZOS)
+                for fmt in formatos:
+                    destino = os.path.join(out_dir, f"{nombre}-{ancho}.{fmt}")
+                    variante.save(destino, fmt.upper(), quality=CALIDAD[fmt])
+                    print(f"{destino}: {os.path.getsize(destino) // 1024} KB")
+
+
+def _find_font(fonts_dir: str, stem: str) -> str | None:
+    for ext in (".woff2", ".ttf", ".otf", ".woff"):
+        path = os.path.join(fonts_dir, stem + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def build_fonts(fonts_dir: str, out_dir: str = os.path.join(STATIC_DIR, "fonts")):
+    from fontTools import subset
+
+    os.makedirs(out_dir, exist_ok=True)
+    for stem, salida, glifos in FUENTES:
+        origen = _find_font(fonts_dir, stem)
+        if origen is None:
+            print(f"skipped {stem}: not found in {fonts_dir}")
+            continue
+        destino = os.path.join(out_dir, f"{salida}.woff2")
+        subset.main([origen, f"--unicodes={TEXTO if glifos == 'texto' else ICONOS}",
+                     "--flavor=woff2", "--layout-features=*", f"--output-file={destino}"])
+        print(f"{destino}: {os.path.getsize(destino) // 1024} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build responsive images and subsetted fonts.")
+    parser.add_argument("--fonts-dir", default="assets/fonts",
+                        help="local copies of Inter, Poppins and fa-solid-900")
+    parser.add_argument("--skip-fonts", action="store_true")
+    args = parser.parse_args()
+    build_images()
+    if not args.skip_fonts:
+        build_fonts(args.fonts_dir)
+
+
+if __name__ == "__main__":
+    main()
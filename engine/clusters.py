@@ -0,0 +1,111 @@
+"""Municipality profiles: mini-batch k-means on the standardized indicators.
+
+Runs in the precompute stage on the same z-scored features as the
+similarity index (``engine.similarity``), so every dataset version gets its
+assignments and centroids once. Mini-batches keep the cost linear in the
+number of municipalities (the national set works the same way). Clusters are
+ordered by their mean opportunity index and named after their most
+distinctive features, so labels stay stable between versions.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from engine.similarity import FEATURES, NeighborIndex
+
+K_CLUSTERS = 6
+BATCH = 256
+MAX_ITER = 200
+TOL = 1e-4
+
+ETIQUETAS = {
+    "centros_por_1000hab": "schools",
+    "viviendas_por_1000hab": "housing",
+    "empresas_por_1000hab": "companies",
+    "Poblacion_Total": "population",
+    "indice_oportunidad": "opportunity"}
+
+# categorical colours (RGBA), one per cluster
+PALETA = [[15, 98, 254, 200], [255, 126, 41, 200], [54, 197, 240, 200],
+          [255, 45, 85, 200], [36, 161, 72, 200], [138, 63, 252, 200],
+          [241, 194, 27, 200], [0, 93, 93, 200], [158, 240, 26, 200], [105, 41, 196, 200]]
+
+
+@dataclass(frozen=True)
+class ClusterModel:
+    municipios: np.ndarray
+    etiquetas: np.ndarray       # cluster of each municipality
+    centroides: np.ndarray      # in the standardized space
+    perfiles: pd.DataFrame      # one row per cluster: nombre, n_municipios, mean features
+
+    def assignments(self) -> pd.DataFrame:
+        """municipio, cluster, perfil and its map colour."""
+        nombres = self.perfiles["nombre"].to_numpy()
+        return pd.DataFrame({
+            "municipio": self.municipios,
+            "cluster": self.etiquetas,
+            "perfil": nombres[self.etiquetas],
+            "cluster_color": [PALETA[c % len(PALETA)] for c in self.etiquetas]})
+
+
+def _nearest(x: np.ndarray, c: np.ndarray) -> np.ndarray:
+    # ||x - c||^2 without the constant ||x||^2 term
+    return np.argmin((c ** 2).sum(axis=1)[None, :] - 2 * x @ c.T, axis=1)
+
+
+def _init_plus_plus(x: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    centros = [x[rng.integers(len(x))]]
+    d2 = ((x - centros[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        p = d2 / d2.sum() if d2.sum() > 0 else None
+        centros.append(x[rng.choice(len(x), p=p)])
+        d2 = np.minimum(d2, ((x - centros[-1]) ** 2).sum(axis=1))
+    return np.array(centros)
+
+
+def minibatch_kmeans(x: np.ndarray, k: int = K_CLUSTERS, batch: int = BATCH,
+                     max_iter: int = MAX_ITER, tol: float = TOL,
+                     seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """(centroids, labels). Each centroid moves towards the mean of its batch
+    points with step n_batch / n_seen, i.e. it is the running mean."""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(x))
+    centros = _init_plus_plus(x, k, rng)
+    vistos = np.zeros(k)
+    for _ in range(max_iter):
+        lote = x[rng.choice(len(x), min(batch, len(x)), replace=False)]
+        asignado = _nearest(lote, centros)
+        n = np.bincount(asignado, minlength=k).astype(float)
+        sumas = np.zeros_like(centros)
+        np.add.at(sumas, asignado, lote)
+        activos = n > 0
+        vistos += n
+        antes = centros.copy()
+        paso = (n[activos] / vistos[activos])[:, None]
+        centros[activos] += paso * (sumas[activos] / n[activos, None] - centros[activos])
+        if np.abs(centros - antes).max() < tol:
+            break
+    return centros, _nearest(x, centros)
+
+
+def _name(z_centro: np.ndarray) -> str:
+    orden = np.argsort(-np.abs(z_centro))[:2]
+    return ", ".join(f"{'high' if z_centro[i] > 0 else 'low'} {ETIQUETAS[FEATURES[i]]}" for i in orden)
+
+
+def build_clusters(index: NeighborIndex, df: pd.DataFrame, k: int = K_CLUSTERS) -> ClusterModel:
+    centros, etiquetas = minibatch_kmeans(index.z, k)
+    # stable numbering: by mean opportunity index, best first
+    orden = np.argsort(-centros[:, FEATURES.index("indice_oportunidad")])
+    rango = np.empty_like(orden)
+    rango[orden] = np.arange(len(orden))
+    centros, etiquetas = centros[orden], rango[etiquetas]
+
+    medias = (df.set_index("municipio").loc[index.municipios, FEATURES]
+              .groupby(etiquetas).mean().reindex(range(len(centros))))
+    perfiles = medias.assign(
+        nombre=[f"{c + 1}: {_name(centros[c])}" for c in range(len(centros))],
+        n_municipios=np.bincount(etiquetas, minlength=len(centros)))
+    return ClusterModel(index.municipios, etiquetas, centros,
+                        perfiles[["nombre", "n_municipios"] + FEATURES])
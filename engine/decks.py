@@ -0,0 +1,174 @@
+"""pydeck layers and decks for the indicator map and the school map.
+
+Colour logic (linear, quantile, tritone, regimen and cluster colours) and the
+layer definitions live here so every entry point draws the same maps; the
+Streamlit views only pick the options and cache the results.
+"""
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+
+from engine.stats import ColumnStats, RegimenStats, quantile_position
+
+# Marker radius (m) per aggregation level: a few big circles at regional scale
+RADIO_NIVEL = {"municipio": 2000, "comarca": 6000, "provincia": 20000}
+
+# Colours by centre type (detailed view)
+COLORES_REGIMEN = {
+    "púb.":        [0, 128, 0, 160],
+    "priv. conc.": [255, 165, 0, 160],
+    "priv.":       [220, 20, 60, 160]}
+COLOR_OTRO = [100, 100, 100, 160]
+
+# Three-tone palette of the general school view
+CLR_A = "#FF9D00"
+CLR_B = "#4DD0E1"
+CLR_C = "#062E57"
+ALPHA = 180
+TRITONE_SCALE = [[0, CLR_A], [0.5, CLR_B], [1, CLR_C]]
+
+HIGHLIGHT = [15, 98, 254, 230]
+
+
+def hex2rgb(h: str) -> tuple[int, int, int]:
+    return tuple(int(h[i:i + 2], 16) for i in (1, 3, 5))
+
+
+#  Indicator map
+
+def quantile_colors(values, stats: ColumnStats) -> list[list[int]]:
+    """Colour by position in the distribution: robust to outliers."""
+    t = quantile_position(values, stats)
+    return [[int(255 * x), int(255 * (1 - x)), 100, 180] for x in t]
+
+
+def map_rows(df: pd.DataFrame, indicador: str, escala: str, stats: ColumnStats) -> pd.DataFrame:
+    """Rows that can be drawn; with the quantile scale, their colours too."""
+    df_mapa = df.dropna(subset=["lat", "lon", indicador])
+    if escala == "Quantile":
+        df_mapa = df_mapa.assign(fill_color=quantile_colors(df_mapa[indicador], stats))
+    return df_mapa
+
+
+def linear_fill(indicador: str, max_val: float) -> str:
+    """Red-to-green colour expression evaluated by deck.gl (linear scale)."""
+    return f"""[
+        255 * ({indicador}) / {max_val},
+        255 * (1 - ({indicador}) / {max_val}),
+        100, 180 ]"""
+
+
+def indicator_layer(data: pd.DataFrame, fill_color, nivel: str = "municipio",
+                    poligonos: bool = False) -> pdk.Layer:
+    if poligonos:
+        return pdk.Layer(
+            "PolygonLayer",
+            data=data,
+            get_polygon="contorno",
+            get_fill_color=fill_color,
+            get_line_color=[255, 255, 255, 200],
+            line_width_min_pixels=0.5, pickable=True)
+    return pdk.Layer(
+        "ScatterplotLayer",
+        data=data,
+        get_position='[lon, lat]',
+        get_radius=RADIO_NIVEL[nivel],
+        get_fill_color=fill_color, pickable=True)
+
+
+def indicator_deck(layer: pdk.Layer, stats: ColumnStats, tooltip: str,
+                   map_style: str = "road") -> pdk.Deck:
+    view_state = pdk.ViewState(
+        latitude=stats.bbox.lat_mean,
+        longitude=stats.bbox.lon_mean,
+        zoom=7, pitch=0)
+    return pdk.Deck(layers=[layer], initial_view_state=view_state,
+                    map_style=map_style, tooltip={"text": tooltip})
+
+
+#  School map
+
+def tritone_colors(t) -> list[list[int]]:
+    """Linear blend A→B (0-0.5) then B→C (0.5-1), as [r, g, b, α] rows."""
+    t = np.asarray(t, dtype=float)[:, None]
+    a, b, c = (np.array(hex2rgb(h), dtype=float) for h in (CLR_A, CLR_B, CLR_C))
+    rgb = np.where(t <= 0.5, a + (b - a) * (t * 2), b + (c - b) * ((t - 0.5) * 2)).astype(int)
+    return np.column_stack([rgb, np.full(len(rgb), ALPHA)]).tolist()
+
+
+def school_markers(marcadores: pd.DataFrame, stats: RegimenStats) -> pd.DataFrame:
+    """Per-localidad markers with the number of schools normalized 0-1 and coloured."""
+    n_min = stats.centros_por_localidad.min
+    n_max = stats.centros_por_localidad.max
+    ratio = (marcadores["n_centros"] - n_min) / (n_max - n_min)
+    return marcadores.assign(ratio=ratio, fill_color=tritone_colors(ratio))
+
+
+def regimen_rows(centros_df: pd.DataFrame, regimen: str) -> pd.DataFrame:
+    filas = centros_df[centros_df["regimen"] == regimen]
+    return filas.assign(color=[COLORES_REGIMEN.get(r, COLOR_OTRO) for r in filas["regimen"]])
+
+
+def general_layer(markers: pd.DataFrame) -> pdk.Layer:
+    return pdk.Layer(
+        "ScatterplotLayer",
+        data=markers,
+        get_position='[lon, lat]',
+        get_radius=2000,
+        get_fill_color='fill_color',
+        pickable=True,
+        auto_highlight=True)
+
+
+def density_layer(celdas: pd.DataFrame, tam_celda: float) -> pdk.Layer:
+    """Hexagon cells (``engine.density``), darker where there are more schools."""
+    alpha = 60 + 195 * celdas["n_centros"].to_numpy() / celdas["n_centros"].max()
+    return pdk.Layer(
+        "ColumnLayer",
+        data=celdas.assign(color=[[6, 46, 87, int(a)] for a in alpha]),
+        get_position='[lon, lat]',
+        disk_resolution=6,
+        radius=tam_celda * 1000,
+        coverage=0.95,
+        extruded=False,
+        get_fill_color='color',
+        pickable=True,
+        auto_highlight=True)
+
+
+def detail_layer(filas: pd.DataFrame) -> pdk.Layer:
+    return pdk.Layer(
+        "ScatterplotLayer",
+        data=filas,
+        get_position='[LONGITUD, LATITUD]',
+        get_radius=100,
+        get_fill_color='color',
+        pickable=True)
+
+
+def highlight_layer(encontrados: pd.DataFrame, pickable: bool) -> pdk.Layer:
+    return pdk.Layer(
+        "ScatterplotLayer",
+        data=encontrados[["DENOMINACION", "tipo", "localidad", "LATITUD", "LONGITUD"]],
+        get_position='[LONGITUD, LATITUD]',
+        get_radius=150,
+        radius_min_pixels=7,
+        get_fill_color=HIGHLIGHT,
+        get_line_color=[255, 255, 255],
+        stroked=True,
+        line_width_min_pixels=2,
+        pickable=pickable)
+
+
+def schools_deck(capas: list[pdk.Layer], view_state: pdk.ViewState, tooltip: dict) -> pdk.Deck:
+    return pdk.Deck(layers=capas, initial_view_state=view_state, tooltip=tooltip, map_style="road")
+
+
+def schools_view(stats: RegimenStats, encontrados: pd.DataFrame | None = None) -> pdk.ViewState:
+    """Whole regimen, or zoomed to the search matches when there are any."""
+    if encontrados is not None and len(encontrados):
+        return pdk.ViewState(
+            latitude=float(encontrados["LATITUD"].mean()),
+            longitude=float(encontrados["LONGITUD"].mean()),
+            zoom=13 if len(encontrados) == 1 else 9)
+    return pdk.ViewState(latitude=stats.bbox.lat_mean, longitude=stats.bbox.lon_mean, zoom=7)
@@ -0,0 +1,68 @@
+"""Hexagonal density grid for the school map.
+
+Schools are binned into flat-top hexagons on a local equirectangular
+projection (km), fully vectorized: axial coordinates, cube rounding, one
+``groupby`` per resolution. The result is a compact cell list (centre, count)
+per regimen and cell size, built with the dataset version, that a pydeck
+``ColumnLayer`` with ``disk_resolution=6`` draws as hexagons; the browser never
+receives the individual points.
+"""
+import numpy as np
+import pandas as pd
+
+# hexagon size (centre to vertex, km), coarse to fine
+RESOLUCIONES = (10.0, 5.0, 2.0, 1.0)
+R_TIERRA_KM = 6371.0088
+LAT_REF = 39.5          # projection centre, middle of the Valencian Community
+_SQRT3 = np.sqrt(3.0)
+
+
+def _project(lat, lon) -> tuple[np.ndarray, np.ndarray]:
+    x = R_TIERRA_KM * np.radians(lon) * np.cos(np.radians(LAT_REF))
+    y = R_TIERRA_KM * np.radians(lat)
+    return x, y
+
+
+def _unproject(x, y) -> tuple[np.ndarray, np.ndarray]:
+    lat = np.degrees(y / R_TIERRA_KM)
+    lon = np.degrees(x / (R_TIERRA_KM * np.cos(np.radians(LAT_REF))))
+    return lat, lon
+
+
+def hex_cells(x, y, size: float) -> tuple[np.ndarray, np.ndarray]:
+    """Axial (q, r) of the flat-top hexagon of ``size`` containing each point."""
+    qf = (2 / 3 * x) / size
+    rf = (-1 / 3 * x + _SQRT3 / 3 * y) / size
+    sf = -qf - rf
+    q, r, s = np.round(qf), np.round(rf), np.round(sf)
+    # cube rounding: fix the coordinate with the largest rounding error
+    dq, dr, ds = np.abs(q - qf), np.abs(r - rf), np.abs(s - sf)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    q = np.where(fix_q, -r - s, q)
+    r = np.where(fix_r, -q - s, r)
+    return q.astype(np.int64), r.astype(np.int64)
+
+
+def hex_centres(q, r, size: float) -> tuple[np.ndarray, np.ndarray]:
+    return size * 1.5 * q, size * _SQRT3 * (r + q / 2)
+
+
+def hexbin(lat, lon, size: float) -> pd.DataFrame:
+    """Cells with at least one point: lat, lon (centre) and n_centros."""
+    lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+    ok = np.isfinite(lat) & np.isfinite(lon)
+    q, r = hex_cells(*_project(lat[ok], lon[ok]), size)
+    cells = (pd.DataFrame({"q": q, "r": r})
+             .value_counts().rename("n_centros").reset_index())
+    cells["lat"], cells["lon"] = _unproject(*hex_centres(cells["q"].to_numpy(),
+                                                         cells["r"].to_numpy(), size))
+    return cells[["lat", "lon", "n_centros"]]
+
+
+def build_density(centros_df: pd.DataFrame,
+                  resoluciones=RESOLUCIONES) -> dict[str, dict[float, pd.DataFrame]]:
+    """regimen -> cell size (km) -> cell list."""
+    return {
+        regimen: {size: hexbin(grupo["LATITUD"], grupo["LONGITUD"], size) for size in resoluciones}
+        for regimen, grupo in centros_df.dropna(subset=["regimen"]).groupby("regimen")}
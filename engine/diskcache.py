@@ -0,0 +1,90 @@
+"""Disk-backed cache tier for derived artifacts.
+
+Entries are keyed by dataset version plus parameters
+(``snapshots.cache_key(version, ...)``) and written atomically (temp file +
+``os.replace``). Values are plain pickles, unpickled into fresh objects on
+every read; large frames that should be shared between processes belong in
+``snapshots`` (memory-mapped ``.npy``) instead. The directory is trimmed
+LRU-style to ``max_bytes`` using file access times, which ``get`` refreshes on
+every hit.
+Survives restarts, so a fresh process starts warm.
+"""
+import os
+import pickle
+import tempfile
+import threading
+
+CACHE_DIR = os.environ.get("EDM_CACHE_DIR", ".cache/artifacts")
+CACHE_MAX_BYTES = int(os.environ.get("EDM_CACHE_MAX_BYTES", 512 * 1024 ** 2))
+
+_MISSING = object()
+
+
+class DiskCache:
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str, default=None):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.loads(f.read())
+        except FileNotFoundError:
+            return default
+        except (pickle.UnpicklingError, EOFError, ValueError, AttributeError, ImportError, TypeError):
+            # truncated by a crash before atomic writes existed, corrupt, or
+            # pickled by code whose classes/modules no longer exist or match
+            self.delete(key)
+            return default
+        os.utime(path)          # mark as recently used
+        return value
+
+    def set(self, key: str, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._evict()
+
+    def delete(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def get_or_compute(self, key: str, compute):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            with os.scandir(self.directory) as it:
+                for e in it:
+                    if e.name.endswith(".pkl"):
+                        st = e.stat()
+                        entries.append((max(st.st_atime, st.st_mtime), st.st_size, e.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
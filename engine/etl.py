@@ -0,0 +1,183 @@
+"""Parallel ETL from the raw housing and company dumps to the indicator table.
+
+Raw files go under ``data/raw/viviendas/`` (housing listings) and
+``data/raw/empresas/`` (company registry), as ``.csv`` or ``.csv.gz`` with one
+record per line and a municipality column (see ``COLUMNAS_MUNICIPIO``).
+
+Map: every plain CSV is cut into byte ranges aligned to line starts and each
+range is parsed by a worker process, which only reads the municipality column
+and returns counts keyed by the folded name (``engine.text.fold``); gzip files
+are one task each. Reduce: the partial counts are summed as they complete.
+The totals replace ``total_ofertas`` / ``empresas_total`` in the indicator
+table, ratios and the opportunity index are recomputed, and the table is
+written in the app's schema.
+
+    python -m engine.etl [--processes 8] [--chunk-mb 64] [--out data/indicadores_municipios.csv]
+"""
+import argparse
+import csv
+import glob
+import gzip
+import io
+import logging
+import os
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from engine.hierarchy import add_ratios
+from engine.text import fold
+
+log = logging.getLogger(__name__)
+
+RAW_DIR = "data/raw"
+# output column -> subdirectory of RAW_DIR
+FUENTES = {"total_ofertas": "viviendas", "empresas_total": "empresas"}
+# first one present in the header is used
+COLUMNAS_MUNICIPIO = ("municipio", "municipi", "municipality", "nombre_municipio", "poblacion", "localidad")
+CHUNK_BYTES = 64 * 1024 ** 2
+
+
+def _header(path: str) -> tuple[list[str], str]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        linea = f.readline().rstrip("\r\n")
+    sep = ";" if linea.count(";") > linea.count(",") else ","
+    return next(csv.reader([linea], delimiter=sep)), sep
+
+
+def _column(header: list[str], path: str) -> str:
+    normal = {fold(c): c for c in header}
+    for nombre in COLUMNAS_MUNICIPIO:
+        if nombre in normal:
+            return normal[nombre]
+    raise ValueError(f"{path}: no municipality column among {header}")
+
+
+def plan_tasks(path: str, chunk_bytes: int = CHUNK_BYTES) -> list[tuple]:
+    """(path, start, end, sep, columna, header) per worker task."""
+    header, sep = _header(path)
+    columna = _column(header, path)
+    if path.endswith(".gz"):
+        return [(path, None, None, sep, columna, header)]
+    size = os.path.getsize(path)
+    return [(path, start, min(start + chunk_bytes, size), sep, columna, header)
+            for start in range(0, size, chunk_bytes)]
+
+
+def count_range(path: str, start: int | None, end: int | None, sep: str,
+                columna: str, header: list[str]) -> Counter:
+    """Map step: records per folded municipality name in one byte range.
+
+    A range owns every line that *starts* inside it, so ranges never share
+    or lose a record.
+    """
+    if start is None:
+        serie = pd.read_csv(path, sep=sep, usecols=[columna], dtype=str)[columna]
+    else:
+        with open(path, "rb") as f:
+            f.seek(start)
+            if start == 0:
+                f.readline()                    # header
+            else:
+                f.seek(start - 1)
+                f.readline()                    # finish the line owned by the previous range
+            datos = f.read(max(0, end - f.tell()))
+            if datos and not datos.endswith(b"\n"):
+                datos += f.readline()
+        if not datos:
+            return Counter()
+        serie = pd.read_csv(io.BytesIO(datos), sep=sep, header=None, names=header,
+                            usecols=[columna], dtype=str)[columna]
+    # fold the distinct names only, not every record
+    por_nombre = serie.value_counts()
+    claves = por_nombre.groupby(por_nombre.index.map(fold)).sum()
+    return Counter(claves.to_dict())
+
+
+def municipio_keys(municipios) -> dict[str, str]:
+    """Folded name -> municipio, for the full name and each bilingual form."""
+    claves = {}
+    for m in municipios:
+        claves[fold(m)] = m
+        for parte in str(m).split("/"):
+            claves.setdefault(fold(parte), m)
+    return claves
+
+
+def run(indicadores: pd.DataFrame, raw_dir: str = RAW_DIR, processes: int | None = None,
+        chunk_bytes: int = CHUNK_BYTES) -> pd.DataFrame:
+    """The indicator table with the counts rebuilt from the raw dumps."""
+    tareas = {}
+    for salida, sub in FUENTES.items():
+        ficheros = sorted(glob.glob(os.path.join(raw_dir, sub, "*.csv"))
+                          + glob.glob(os.path.join(raw_dir, sub, "*.csv.gz")))
+        tareas[salida] = [t for path in ficheros for t in plan_tasks(path, chunk_bytes)]
+
+    claves = municipio_keys(indicadores["municipio"])
+    out = indicadores.copy()
+    with ProcessPoolExecutor(processes) as pool:
+        futuros = {pool.submit(count_range, *t): salida
+                   for salida, lista in tareas.items() for t in lista}
+        # reduce: merge the partial counts as the workers finish
+        totales = {salida: Counter() for salida, lista in tareas.items() if lista}
+        for futuro in as_completed(futuros):
+            totales[futuros[futuro]].update(futuro.result())
+
+    for salida, cuenta in totales.items():
+        por_municipio = Counter()
+        sin_casar = 0
+        for clave, n in cuenta.items():
+            if clave in claves:
+                por_municipio[claves[clave]] += n
+            else:
+                sin_casar += n
+        if sin_casar:
+            log.warning("%s: %d records with an unknown municipality", salida, sin_casar)
+        # no record in the dumps is "unknown" (NA), not a real zero
+        out[salida] = out["municipio"].map(dict(por_municipio)).astype(float)
+    return add_ratios(out)[list(indicadores.columns)]
+
+
+def _cells(col: pd.Series) -> pd.Series:
+    """One column as the shipped CSV writes it (R's ``write.csv``): quoted
+    text, numbers with 15 significant digits (so 0.0 is ``0``), bare NA."""
+    if pd.api.types.is_numeric_dtype(col):
+        texto = col.map(lambda v: format(v, ".15g"), na_action="ignore")
+    else:
+        texto = '"' + col.astype(str).str.replace('"', '""') + '"'
+    return texto.where(col.notna(), "NA")
+
+
+def write_table(df: pd.DataFrame, path: str):
+    """Same format as the shipped CSV, written atomically: an unchanged table
+    comes out byte for byte identical."""
+    cabecera = ",".join(f'"{c}"' for c in df.columns)
+    filas = pd.concat([_cells(df[c]) for c in df.columns], axis=1).agg(",".join, axis=1)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".csv")
+    with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+        f.write("\n".join([cabecera, *filas]) + "\n")
+    os.replace(tmp, path)
+
+
+def main():
+    from engine.refresh import INDICADORES_CSV
+
+    parser = argparse.ArgumentParser(description="Rebuild housing and company counts from the raw dumps.")
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-mb", type=int, default=CHUNK_BYTES // 1024 ** 2)
+    parser.add_argument("--indicadores", default=INDICADORES_CSV, help="table providing the other columns")
+    parser.add_argument("--out", default=INDICADORES_CSV)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    df = run(pd.read_csv(args.indicadores), args.raw_dir, args.processes, args.chunk_mb * 1024 ** 2)
+    write_table(df, args.out)
+    print(f"{len(df)} municipalities -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
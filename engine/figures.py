@@ -0,0 +1,145 @@
+"""Plotly theme and the comparator figures.
+
+Importing this module registers the corporate "vcv" template, so figures
+look the same in the app and in exported reports.
+"""
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+    # Colors we are going to use
+PRIMARY       = "#0F62FE"
+PRIMARY_DARK  = "#0043CE"
+PRIMARY_LIGHT = "#E3EDFF"
+GRAY_50       = "#FAFBFC"
+GRAY_100      = "#F1F3F5"
+GRAY_200      = "#7E7E7E"
+TEXT_COLOR    = "#222222"
+
+    # Plotly configuration
+corporate_layout = go.Layout(
+    font=dict(family="Inter, sans-serif", color= TEXT_COLOR, size=13),
+    title=dict(font=dict(family="Poppins, sans-serif", size=20,
+                         color=PRIMARY_DARK)),
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor="rgba(0,0,0,0)",
+    xaxis=dict(showgrid=True, gridcolor=GRAY_100,
+               zerolinecolor=GRAY_100),
+    yaxis=dict(showgrid=True, gridcolor=GRAY_100,
+               zerolinecolor=GRAY_100),
+    legend=dict(
+        bgcolor="rgba(0,0,0,0)", orientation="h",
+        y=-0.25, x=0.5, xanchor="center",
+        font=dict(size=12)
+    ),
+    colorway=[PRIMARY, "#FF7E29", "#36C5F0", "#FF2D55"]
+)
+pio.templates["vcv"] = go.layout.Template(layout=corporate_layout)
+px.defaults.template = "vcv"                                # <── tema por defecto
+px.defaults.color_discrete_sequence = corporate_layout.colorway
+
+RATIOS = ["centros_por_1000hab", "viviendas_por_1000hab", "empresas_por_1000hab"]
+
+
+def absolute_table(df_sel: pd.DataFrame) -> pd.DataFrame:
+    return (
+        df_sel[["municipio", "Poblacion_Total", "n_centros_total",
+                "total_ofertas", "empresas_total"]]
+        .rename(columns={
+            "Poblacion_Total": "Population", "n_centros_total": "Schools",
+            "total_ofertas": "Housing offers", "empresas_total": "Companies"
+        })
+        .set_index("municipio"))
+
+
+def fig_comparison(df_graf: pd.DataFrame, normalizado: bool) -> go.Figure:
+    return px.bar(
+        df_graf.reset_index(), x="municipio",
+        y=df_graf.columns.tolist(), barmode="group",
+        labels={"value": "Value", "variable": "Indicator"},
+        title="Indicator comparison" + (" (normalized)" if normalizado else ""))
+
+
+def fig_individual(df_sel: pd.DataFrame, ind: str) -> go.Figure:
+    return px.bar(df_sel, x="municipio", y=ind,
+                  title=ind.replace('_', ' ').capitalize())
+
+
+def fig_radar(df_norm: pd.DataFrame) -> go.Figure:
+    fig_rad = go.Figure()
+    for m in df_norm.index:
+        fig_rad.add_trace(go.Scatterpolar(
+            r=df_norm.loc[m].values, theta=df_norm.columns,
+            fill='toself', name=m))
+    fig_rad.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])))
+    return fig_rad
+
+
+def fig_pie(municipio: str, vals: pd.Series) -> go.Figure:
+    return px.pie(names=["Education", "Housing", "Employment"],
+                  values=vals.tolist(), title=municipio)
+
+
+def fig_opportunity(df_sel: pd.DataFrame) -> go.Figure:
+    return px.bar(df_sel, x="municipio", y="indice_oportunidad",
+                  title="Opportunity index comparison")
+
+
+def fig_scatter(df_sel: pd.DataFrame) -> go.Figure:
+    # municipalities without ratios (no population figure) have no point to draw
+    df_sel = df_sel.dropna(subset=["viviendas_por_1000hab", "empresas_por_1000hab", "indice_oportunidad"])
+    return px.scatter(df_sel, x="viviendas_por_1000hab", y="empresas_por_1000hab",
+                      color="municipio", size="indice_oportunidad",
+                      hover_name="municipio",
+                      title="Housing (per 1000 inh.) vs Companies (per 1000 inh.)")
+
+
+def fig_rank_interval(tabla: pd.DataFrame) -> go.Figure:
+    """Median rank with its 5-95 % interval over the weight samples (rank 1 on top)."""
+    fig = go.Figure(go.Scatter(
+        x=tabla["rango_mediana"], y=tabla.index, mode="markers",
+        marker=dict(size=12, color=PRIMARY),
+        error_x=dict(type="data", symmetric=False,
+                     array=tabla["rango_p95"] - tabla["rango_mediana"],
+                     arrayminus=tabla["rango_mediana"] - tabla["rango_p5"])))
+    fig.update_layout(title="Rank under random weights (median, 5-95 %)",
+                      xaxis=dict(title="Rank", autorange="reversed"), height=120 + 50 * len(tabla))
+    return fig
+
+
+def fig_evolution(serie_larga: pd.DataFrame, indicador: str) -> go.Figure:
+    return px.line(serie_larga, x="periodo", y=indicador, color="municipio", markers=True,
+                   title=indicador.replace('_', ' ').capitalize() + " by month")
+
+
+def fig_colorbar(colorscale, cmin: float, cmax: float, title: str,
+                 tickvals=None, ticktext=None) -> go.Figure:
+    """Horizontal colour bar on its own, used as the legend under the maps."""
+    colorbar = dict(orientation="h", title=title, x=0, xanchor="left",
+                    len=1.0, thickness=30, thicknessmode="pixels", outlinewidth=0)
+    if tickvals is not None:
+        colorbar.update(tickvals=list(tickvals), ticktext=list(ticktext))
+    fig = go.Figure(go.Scatter(
+        x=[None], y=[None], mode="markers",
+        marker=dict(colorscale=colorscale, cmin=cmin, cmax=cmax, showscale=True,
+                    colorbar=colorbar, size=1, color=[cmin]),
+        hoverinfo="skip"))
+    fig.update_layout(
+        xaxis=dict(visible=False), yaxis=dict(visible=False),
+        height=140, margin=dict(t=10, b=10, l=50, r=0))
+    return fig
+
+
+def comparator_figures(comparacion: dict) -> list[tuple[str, go.Figure]]:
+    """Every comparator chart, in page order (normalized bar chart)."""
+    df_sel = comparacion["indicadores"]
+    df_norm = comparacion["normalizado"]
+    figuras = [("Indicator comparison", fig_comparison(df_norm, True))]
+    figuras += [("Individual indicators", fig_individual(df_sel, ind)) for ind in RATIOS]
+    figuras.append(("Relative profile (Radar)", fig_radar(df_norm)))
+    figuras += [("Normalized distribution of indicators", fig_pie(m, vals))
+                for m, vals in comparacion["normalizado_global"].iterrows()]
+    figuras.append(("Opportunity index", fig_opportunity(df_sel)))
+    figuras.append(("Housing vs companies relationship", fig_scatter(df_sel)))
+    return figuras
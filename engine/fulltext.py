@@ -0,0 +1,121 @@
+"""Ranked full-text search over the educational centers.
+
+``TextIndex`` is an inverted index over ``DENOMINACION``, ``tipo`` and
+``localidad``, built once per dataset version. Every (term, center) posting
+carries its BM25 score already summed over the fields (weighted by ``CAMPOS``),
+so a query is a few ``bincount`` calls: centers matching every query term come
+first, ranked by score, and the last term also matches as a prefix while the
+user is still typing. Regimen and distance filters are applied as masks
+before ranking.
+"""
+import bisect
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from engine.accessibility import haversine_km
+from engine.text import fold
+
+# field -> weight in the score
+CAMPOS = {"DENOMINACION": 3.0, "localidad": 2.0, "tipo": 1.0}
+K1, B = 1.2, 0.75
+
+# articles, prepositions and conjunctions in both languages
+STOPWORDS = frozenset("""
+    a al amb d de del dels el els en i l la las les lo los per y
+""".split())
+
+# Spanish forms of words that the center types and names use in Valencian
+SINONIMOS = {
+    "colegio": "collegi", "instituto": "institut", "escuela": "escola",
+    "centro": "centre", "privado": "privat", "publico": "public",
+    "educacion": "educacio", "adultos": "adultes", "personas": "persones",
+    "danza": "dansa", "idiomas": "idiomes", "arte": "art",
+    "formacion": "formacio", "profesional": "professional",
+}
+# prefix matches expanded per query for the (possibly unfinished) last term
+MAX_PREFIJOS = 30
+
+
+def tokenize(texto: str) -> list[str]:
+    """Folded terms without stopwords; "col·legi" -> "collegi"."""
+    texto = str(texto).replace("·", "")
+    terminos = [SINONIMOS.get(t, t) for t in fold(texto).split()]
+    return [t for t in terminos if t not in STOPWORDS]
+
+
+class TextIndex:
+    def __init__(self, centros_df: pd.DataFrame, campos: dict[str, float] = CAMPOS):
+        self.n = len(centros_df)
+        self.lat = centros_df["LATITUD"].to_numpy(dtype=float)
+        self.lon = centros_df["LONGITUD"].to_numpy(dtype=float)
+        self.regimen = centros_df["regimen"].to_numpy(dtype=object)
+
+        puntuacion = defaultdict(float)         # (term, doc) -> score
+        for campo, peso in campos.items():
+            docs = [tokenize(v) if pd.notna(v) else [] for v in centros_df[campo]]
+            largos = np.array([len(d) for d in docs], dtype=float)
+            media = largos.mean() or 1.0
+            df_term = defaultdict(int)
+            for d in docs:
+                for t in set(d):
+                    df_term[t] += 1
+            for i, d in enumerate(docs):
+                for t in set(d):
+                    tf = d.count(t)
+                    idf = np.log(1 + (self.n - df_term[t] + 0.5) / (df_term[t] + 0.5))
+                    norma = tf + K1 * (1 - B + B * largos[i] / media)
+                    puntuacion[t, i] += peso * idf * tf * (K1 + 1) / norma
+
+        postings = defaultdict(lambda: ([], []))
+        for (t, i), s in puntuacion.items():
+            postings[t][0].append(i)
+            postings[t][1].append(s)
+        self.terminos = sorted(postings)
+        self.docs = [np.asarray(postings[t][0], dtype=np.int32) for t in self.terminos]
+        self.scores = [np.asarray(postings[t][1], dtype=np.float32) for t in self.terminos]
+        self._pos = {t: k for k, t in enumerate(self.terminos)}
+
+    def _prefix(self, prefijo: str) -> list[int]:
+        inicio = bisect.bisect_left(self.terminos, prefijo)
+        fin = bisect.bisect_left(self.terminos, prefijo + "\uffff")
+        return list(range(inicio, min(fin, inicio + MAX_PREFIJOS)))
+
+    def mask(self, regimenes=None, cerca: tuple[float, float, float] | None = None) -> np.ndarray:
+        """Centers allowed by the filters; ``cerca`` is (lat, lon, radius in km)."""
+        permitido = np.ones(self.n, dtype=bool)
+        if regimenes is not None:
+            permitido &= np.isin(self.regimen, list(regimenes))
+        if cerca is not None:
+            lat, lon, radio = cerca
+            dist = haversine_km(np.array([lat]), np.array([lon]), self.lat, self.lon)[0]
+            permitido &= dist <= radio
+        return permitido
+
+    def search(self, consulta: str, limit: int = 50, regimenes=None,
+               cerca: tuple[float, float, float] | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Positions (into ``centros_df``) and scores, best first."""
+        terminos = tokenize(consulta)
+        if not terminos:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+        total = np.zeros(self.n, dtype=np.float32)
+        cubiertos = np.zeros(self.n, dtype=np.int32)
+        for k, t in enumerate(terminos):
+            ids = ([self._pos[t]] if t in self._pos else []) if k < len(terminos) - 1 else self._prefix(t)
+            if not ids:
+                continue
+            docs = np.concatenate([self.docs[j] for j in ids])
+            puntos = np.bincount(docs, np.concatenate([self.scores[j] for j in ids]), self.n)
+            total += puntos.astype(np.float32)
+            cubiertos += puntos > 0
+
+        # every term must match; partial matches only when nothing matches fully
+        permitido = self.mask(regimenes, cerca)
+        candidatos = (cubiertos == len(terminos)) & permitido
+        if not candidatos.any():
+            candidatos = (cubiertos > 0) & permitido
+        pos = np.flatnonzero(candidatos)
+        orden = pos[np.argsort(-(total[pos] + cubiertos[pos] * 1000), kind="stable")][:limit]
+        return orden.astype(np.int32), total[orden]
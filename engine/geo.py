@@ -0,0 +1,16 @@
+"""Coordinate fixes applied when the source tables are loaded."""
+import numpy as np
+
+
+def normalize_lat(lat) -> np.ndarray:
+    """Undo the lost decimal point in ``lat`` (4006077005 -> 40.06077005).
+
+    Vectorized version of ``convertir_numero``: keep two integer digits.
+    Idempotent, so already fixed latitudes pass through unchanged.
+    """
+    lat = np.asarray(lat, dtype=float)
+    out = lat.copy()
+    bad = np.abs(lat) > 90
+    digits = np.floor(np.log10(np.abs(lat[bad]))) + 1
+    out[bad] = lat[bad] / 10 ** (digits - 2)
+    return out
@@ -0,0 +1,153 @@
+"""Municipal boundaries for the choropleth map.
+
+Loads a local GeoJSON (``data/municipios.geojson``, one feature per
+municipality) and precomputes one simplified copy per zoom level. Shared
+borders are split into arcs at the points where the set of neighbouring
+polygons changes, and every arc is simplified once (Douglas-Peucker) and
+reused by both sides, so neighbours never open gaps or overlap. The packed
+result (rounded coordinates, one row per polygon) is built once per dataset
+version and joined to the indicator table by name.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from engine.text import fold
+
+LIMITES_GEOJSON = "data/municipios.geojson"
+NAME_PROPERTIES = ("municipio", "nombre", "NAMEUNIT", "name", "NAME")
+# zoom level -> tolerance in degrees (about 1 km, 300 m, 80 m, 20 m)
+TOLERANCIAS = {5: 0.01, 7: 0.003, 9: 0.0008, 11: 0.0002}
+DECIMALES = 5
+
+
+def _feature_name(props: dict) -> str | None:
+    for key in NAME_PROPERTIES:
+        if props.get(key):
+            return str(props[key])
+    return None
+
+
+def read_polygons(raw: bytes) -> list[tuple[str, list[np.ndarray]]]:
+    """(folded name, rings) for every polygon; MultiPolygons are exploded."""
+    poligonos = []
+    for feat in json.loads(raw)["features"]:
+        geom = feat.get("geometry") or {}
+        nombre = _feature_name(feat.get("properties") or {})
+        if nombre is None:
+            continue
+        if geom.get("type") == "Polygon":
+            partes = [geom["coordinates"]]
+        elif geom.get("type") == "MultiPolygon":
+            partes = geom["coordinates"]
+        else:
+            continue
+        for rings in partes:
+            poligonos.append((fold(nombre), [np.asarray(r, dtype=float)[:, :2] for r in rings]))
+    return poligonos
+
+
+def douglas_peucker(pts: np.ndarray, tol: float) -> np.ndarray:
+    """Keep-mask of the points that survive simplification (endpoints kept)."""
+    keep = np.zeros(len(pts), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(pts) - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        seg = pts[b] - pts[a]
+        rel = pts[a + 1:b] - pts[a]
+        norm = np.hypot(*seg)
+        if norm == 0:
+            d = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            d = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / norm
+        i = int(np.argmax(d))
+        if d[i] > tol:
+            m = a + 1 + i
+            keep[m] = True
+            stack.append((a, m))
+            stack.append((m, b))
+    return keep
+
+
+def _junctions(rings: list[np.ndarray]) -> list[np.ndarray]:
+    """Per ring, the vertices where the set of rings sharing the border changes."""
+    owners = {}
+    claves = []
+    for rid, ring in enumerate(rings):
+        k = [tuple(p) for p in np.round(ring[:-1], 7)]
+        claves.append(k)
+        for p in k:
+            owners.setdefault(p, set()).add(rid)
+    result = []
+    for k in claves:
+        own = [frozenset(owners[p]) for p in k]
+        n = len(own)
+        result.append(np.array([own[i] != own[i - 1] or own[i] != own[(i + 1) % n]
+                                for i in range(n)], dtype=bool))
+    return result
+
+
+def simplify_shared(rings: list[np.ndarray], tol: float) -> list[np.ndarray]:
+    """Simplify all rings together so that shared arcs stay identical."""
+    arcos = {}
+    out = []
+    for ring, junct in zip(rings, _junctions(rings)):
+        pts = ring[:-1]
+        n = len(pts)
+        if n < 4:
+            out.append(ring)
+            continue
+        fijos = np.flatnonzero(junct)
+        if len(fijos) == 0:
+            # ring shares no border: anchor it at the first and farthest points
+            lejano = int(np.argmax(np.hypot(*(pts - pts[0]).T)))
+            fijos = np.array(sorted({0, lejano}))
+        # rotate so the ring starts on a fixed point, then walk arc by arc
+        pts = np.roll(pts, -fijos[0], axis=0)
+        fijos = np.append(fijos - fijos[0], n)
+        keep = np.zeros(n + 1, dtype=bool)
+        cerrado = np.vstack([pts, pts[:1]])
+        for a, b in zip(fijos[:-1], fijos[1:]):
+            arco = cerrado[a:b + 1]
+            clave = tuple(map(tuple, np.round(arco, 7)))
+            invertido = clave[0] > clave[-1]
+            if invertido:
+                clave = clave[::-1]
+            if clave not in arcos:
+                base = arco[::-1] if invertido else arco
+                arcos[clave] = douglas_peucker(base, tol)
+            mask = arcos[clave][::-1] if invertido else arcos[clave]
+            keep[a:b + 1] |= mask
+        simple = cerrado[keep]
+        out.append(simple if len(simple) >= 4 else ring)
+    return out
+
+
+def pack(rings: list[np.ndarray]) -> list:
+    return [np.round(r, DECIMALES).tolist() for r in rings]
+
+
+def build_levels(raw: bytes) -> dict[int, pd.DataFrame]:
+    """zoom -> DataFrame(key, contorno), one row per polygon."""
+    poligonos = read_polygons(raw)
+    todos, indices = [], []
+    for nombre, rings in poligonos:
+        indices.append((len(todos), len(todos) + len(rings)))
+        todos.extend(rings)
+    niveles = {}
+    for zoom, tol in TOLERANCIAS.items():
+        simples = simplify_shared(todos, tol)
+        niveles[zoom] = pd.DataFrame({
+            "key": [nombre for nombre, _ in poligonos],
+            "contorno": [pack(simples[a:b]) for a, b in indices]})
+    return niveles
+
+
+def join_indicators(geometrias: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """Attach the indicator row of each municipality to its polygons."""
+    datos = df.assign(key=df["municipio"].map(fold))
+    return geometrias.merge(datos, on="key", how="inner")
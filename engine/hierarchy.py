@@ -0,0 +1,56 @@
+"""Roll-up of the indicator table to comarca and province.
+
+Driven by a local mapping file ``data/jerarquia_municipios.csv`` with
+columns ``municipio,comarca,provincia``; without it only the municipality
+level exists. Absolute counts are summed and the per-1000 ratios are
+recomputed from the sums, i.e. population-weighted. Built once per dataset
+version together with the rest of the derived data.
+"""
+import pandas as pd
+
+JERARQUIA_CSV = "data/jerarquia_municipios.csv"
+NIVELES = ["municipio", "comarca", "provincia"]
+
+CONTEOS = ["Poblacion_Total", "n_centros_total", "total_ofertas", "empresas_total"]
+# opportunity index weights: 40 % education, 30 % housing, 30 % employment
+PESOS_INDICE = {"centros_por_1000hab": 0.4, "viviendas_por_1000hab": 0.3, "empresas_por_1000hab": 0.3}
+# population-weighted means rather than sums
+MEDIAS = ["lat", "lon", "dist_centro_km", "dist_media_centros_km"]
+
+
+def _aggregate(df: pd.DataFrame, nivel: str) -> pd.DataFrame:
+    datos = df.dropna(subset=[nivel, "Poblacion_Total"])
+    grupos = datos.groupby(nivel)
+    out = grupos[CONTEOS].sum()
+    out["n_municipios"] = grupos.size()
+
+    pob = datos["Poblacion_Total"]
+    for col in MEDIAS:
+        if col in datos.columns:
+            valido = datos[col].notna()
+            pesado = (datos[col] * pob).where(valido).groupby(datos[nivel]).sum()
+            out[col] = pesado / pob.where(valido).groupby(datos[nivel]).sum()
+
+    return add_ratios(out).reset_index()
+
+
+def add_ratios(out: pd.DataFrame) -> pd.DataFrame:
+    """Per-1000 ratios and the opportunity index from the absolute counts."""
+    out["centros_por_1000hab"] = out["n_centros_total"] / out["Poblacion_Total"] * 1000
+    out["viviendas_por_1000hab"] = out["total_ofertas"] / out["Poblacion_Total"] * 1000
+    out["empresas_por_1000hab"] = out["empresas_total"] / out["Poblacion_Total"] * 1000
+    out["indice_oportunidad"] = sum(out[c] * w for c, w in PESOS_INDICE.items())
+    return out
+
+
+def rollup(df: pd.DataFrame, jerarquia: pd.DataFrame | None) -> dict[str, pd.DataFrame]:
+    """The roll-up cube: one indicator table per available level."""
+    niveles = {"municipio": df}
+    if jerarquia is None:
+        return niveles
+    datos = df.merge(jerarquia[["municipio", "comarca", "provincia"]], on="municipio", how="left")
+    for nivel in NIVELES[1:]:
+        if datos[nivel].notna().any():
+            niveles[nivel] = _aggregate(datos, nivel)
+    return niveles
+
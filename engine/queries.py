@@ -0,0 +1,52 @@
+"""The questions the app answers, as plain functions over a ``Dataset``.
+
+Used by the Streamlit tabs and by the headless API (``engine.api``), so both
+return exactly the same results.
+"""
+import numpy as np
+import pandas as pd
+
+RATIOS = ["centros_por_1000hab", "viviendas_por_1000hab", "empresas_por_1000hab"]
+
+
+def search_minimums(df: pd.DataFrame, min_centros: float = 1.0,
+                    min_viviendas: float = 1.0, min_empresas: float = 100.0,
+                    max_dist_km: float | None = None) -> pd.DataFrame:
+    """SEARCH tab: municipalities meeting every minimum, best index first."""
+    mask = ((df["centros_por_1000hab"] >= min_centros) &
+            (df["viviendas_por_1000hab"] >= min_viviendas) &
+            (df["empresas_por_1000hab"] >= min_empresas))
+    if max_dist_km is not None and "dist_centro_km" in df.columns:
+        mask &= df["dist_centro_km"] <= max_dist_km
+    return df[mask].sort_values("indice_oportunidad", ascending=False)
+
+
+def max_dist_bound(catalog) -> float | None:
+    """Upper end (and default) of the search tab's distance slider."""
+    if "dist_centro_km" not in catalog.indicadores:
+        return None
+    return float(np.ceil(catalog.indicadores["dist_centro_km"].max))
+
+
+def compare(df: pd.DataFrame, municipios, maximos: pd.Series | None = None) -> dict:
+    """COMPARATOR tab metrics for a selection of municipalities."""
+    df_sel = df[df["municipio"].isin(municipios)]
+    if maximos is None:
+        maximos = df[RATIOS].max()
+    ratios = df_sel.set_index("municipio")[RATIOS]
+    resumen = {col: (df_sel.loc[df_sel[col].idxmax(), "municipio"]
+                     if df_sel[col].notna().any() else None)
+               for col in ["indice_oportunidad"] + RATIOS}
+    return {
+        "indicadores": df_sel,
+        # normalized by the selection's maxima (bar chart, radar)
+        "normalizado": ratios / ratios.max(),
+        # normalized by the whole dataset (pie charts)
+        "normalizado_global": ratios / maximos[RATIOS],
+        "mejor": resumen,
+        "pequenos": df_sel[df_sel["Poblacion_Total"] < 1000]["municipio"].tolist()}
+
+
+def school_aggregates(dataset, regimen: str) -> pd.DataFrame:
+    """EDUCATIONAL CENTERS tab: schools per localidad for one regimen."""
+    return dataset.marcadores.get(regimen, pd.DataFrame(columns=["localidad", "n_centros", "lat", "lon"]))
@@ -0,0 +1,223 @@
+"""Dataset versions and the background refresher that swaps them in.
+
+Sessions always read ``store.current()``. When a CSV under ``data/`` changes,
+the next version is built (parse, derive, aggregate) in a worker thread and
+only then replaces the current one, so no session ever blocks on the reload.
+"""
+import io
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from engine.accessibility import ACCESIBILIDAD_CSV, merge_accessibility
+from engine.diskcache import DiskCache
+from engine.clusters import ClusterModel, build_clusters
+from engine.density import build_density
+from engine.fulltext import TextIndex
+from engine.geo import normalize_lat
+from engine.geometry import LIMITES_GEOJSON, build_levels
+from engine.hierarchy import JERARQUIA_CSV, rollup
+from engine.search import FuzzyIndex
+from engine.similarity import NeighborIndex, build_index
+from engine.snapshots import SnapshotManager, cache_key, content_hash
+from engine.stats import StatsCatalog, build_catalog
+
+log = logging.getLogger(__name__)
+
+INDICADORES_CSV = "data/indicadores_municipios.csv"
+CENTROS_CSV = "data/centroseducativos_filtrados.csv"
+
+# bump when what load_dataset()/derive() persist changes shape or meaning
+# (Dataset fields, derived tuple, pickled index classes, loaded columns): keys
+# the derived cache and the snapshots, never the data version itself
+SCHEMA_VERSION = 3
+
+
+@dataclass(frozen=True)
+class Dataset:
+    version: str                # content hash of the source files
+    df: pd.DataFrame
+    centros_df: pd.DataFrame
+    catalog: StatsCatalog
+    # schools grouped by localidad, one frame per regimen (general map view)
+    marcadores: dict[str, pd.DataFrame]
+    vecinos: NeighborIndex
+    # roll-up cube: "municipio" plus "comarca"/"provincia" when mapped
+    niveles: dict[str, pd.DataFrame]
+    # simplified municipal polygons per zoom level (empty without a GeoJSON)
+    geometrias: dict[int, pd.DataFrame]
+    # hexagon density cells per regimen and cell size (km)
+    densidad: dict[str, dict[float, pd.DataFrame]]
+    # typo-tolerant lookup over municipality names and school DENOMINACION
+    buscador: FuzzyIndex
+    buscador_centros: FuzzyIndex
+    # ranked full-text search over DENOMINACION, tipo and localidad
+    indice_centros: TextIndex
+    # municipality profiles (k-means on the same standardized features as vecinos)
+    clusters: ClusterModel
+    loaded_at: float = field(default_factory=time.time)
+
+
+def group_centros(centros_df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    return {
+        regimen: (grupo.groupby("localidad")
+                  .agg(n_centros=("DENOMINACION", "count"),
+                       lat=("LATITUD", "mean"),
+                       lon=("LONGITUD", "mean"))
+                  .reset_index())
+        for regimen, grupo in centros_df.dropna(subset=["regimen"]).groupby("regimen")}
+
+
+def _read_bytes(path: str, optional: bool = False) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        if optional:
+            return b""
+        raise
+
+
+def dataset_version(indicadores_csv: str = INDICADORES_CSV,
+                    centros_csv: str = CENTROS_CSV,
+                    accesibilidad_csv: str = ACCESIBILIDAD_CSV,
+                    jerarquia_csv: str = JERARQUIA_CSV,
+                    limites_geojson: str = LIMITES_GEOJSON) -> str:
+    return content_hash(_read_bytes(indicadores_csv), _read_bytes(centros_csv),
+                        _read_bytes(accesibilidad_csv, optional=True),
+                        _read_bytes(jerarquia_csv, optional=True),
+                        _read_bytes(limites_geojson, optional=True))
+
+
+def load_dataset(indicadores_csv: str = INDICADORES_CSV,
+                 centros_csv: str = CENTROS_CSV,
+                 accesibilidad_csv: str = ACCESIBILIDAD_CSV,
+                 jerarquia_csv: str = JERARQUIA_CSV,
+                 limites_geojson: str = LIMITES_GEOJSON,
+                 cache: DiskCache | None = None) -> Dataset:
+    raw_ind, raw_cen = _read_bytes(indicadores_csv), _read_bytes(centros_csv)
+    # output of the accessibility pipeline, merged in when it has been run
+    raw_acc = _read_bytes(accesibilidad_csv, optional=True)
+    # municipio -> comarca/provincia mapping, if provided
+    raw_jer = _read_bytes(jerarquia_csv, optional=True)
+    # municipal boundaries for the choropleth, if provided
+    raw_geo = _read_bytes(limites_geojson, optional=True)
+    version = content_hash(raw_ind, raw_cen, raw_acc, raw_jer, raw_geo)
+    df = pd.read_csv(io.BytesIO(raw_ind))
+    # one coordinate convention for every consumer: the CSV lost the decimal point
+    df["lat"] = normalize_lat(df["lat"])
+    if raw_acc:
+        df = merge_accessibility(df, pd.read_csv(io.BytesIO(raw_acc)))
+    centros_df = pd.read_csv(io.BytesIO(raw_cen))
+    jerarquia = pd.read_csv(io.BytesIO(raw_jer)) if raw_jer else None
+
+    def derive():
+        niveles = rollup(df, jerarquia)
+        vecinos = build_index(df)
+        return (build_catalog(df, centros_df, niveles), group_centros(centros_df),
+                vecinos, niveles, build_levels(raw_geo) if raw_geo else {},
+                build_density(centros_df),
+                FuzzyIndex(df["municipio"].unique()),
+                FuzzyIndex(centros_df["DENOMINACION"], separador=None),
+                TextIndex(centros_df),
+                build_clusters(vecinos, df))
+
+    if cache is None:
+        derived = derive()
+    else:
+        derived = cache.get_or_compute(cache_key(version, "derived", SCHEMA_VERSION), derive)
+    return Dataset(version, df, centros_df, *derived)
+
+
+def _signature(paths) -> tuple:
+    """Cheap change detector: (mtime, size) of every source file."""
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except FileNotFoundError:
+            sig.append(None)
+            continue
+        sig.append((st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+class DatasetStore:
+    """Holds the current ``Dataset`` and refreshes it in the background."""
+
+    def __init__(self, indicadores_csv: str = INDICADORES_CSV,
+                 centros_csv: str = CENTROS_CSV,
+                 accesibilidad_csv: str = ACCESIBILIDAD_CSV,
+                 jerarquia_csv: str = JERARQUIA_CSV,
+                 limites_geojson: str = LIMITES_GEOJSON, interval: float = 5.0,
+                 snapshots: SnapshotManager | None = None,
+                 cache: DiskCache | None = None,
+                 on_version: Callable[[Dataset], None] | None = None):
+        self.paths = (indicadores_csv, centros_csv, accesibilidad_csv,
+                      jerarquia_csv, limites_geojson)
+        self.interval = interval
+        self.snapshots = snapshots
+        self.cache = cache
+        # called with every version swapped in (and the initial one on start)
+        self.on_version = on_version
+        self._lock = threading.Lock()       # serialises rebuilds, not reads
+        self._stop = threading.Event()
+        self._thread = None
+        self._signature = _signature(self.paths)
+        self._dataset = self._load()
+
+    def _load(self) -> Dataset:
+        dataset = load_dataset(*self.paths, cache=self.cache)
+        if self.snapshots is not None:
+            dataset = self.snapshots.register(dataset, SCHEMA_VERSION)
+        return dataset
+
+    def current(self) -> Dataset:
+        # a single attribute read: always a complete version, never a mix
+        return self._dataset
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild if the sources changed. Returns True when a new version was swapped in."""
+        with self._lock:
+            try:
+                sig = _signature(self.paths)
+                if sig == self._signature and not force:
+                    return False
+                # touched but identical content: same version, nothing to rebuild
+                if dataset_version(*self.paths) == self._dataset.version and not force:
+                    self._signature = sig
+                    return False
+                nuevo = self._load()
+                # the file may have been rewritten while we were parsing it
+                if _signature(self.paths) != sig:
+                    return False
+            except Exception:
+                # half-written CSV or missing file: keep serving the old version
+                log.exception("Dataset refresh failed, keeping the current version")
+                return False
+            self._dataset = nuevo
+            self._signature = sig
+            log.info("Dataset refreshed")
+        if self.on_version is not None:
+            self.on_version(nuevo)
+        return True
+
+    def start(self) -> "DatasetStore":
+        if self._thread is None:
+            if self.on_version is not None:
+                self.on_version(self._dataset)
+            self._thread = threading.Thread(target=self._run, name="dataset-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh()
@@ -0,0 +1,233 @@
+"""Static report bundles for comparator selections.
+
+A report is a self-contained ``report.html`` (tables, summary and every
+comparator chart) plus, when ``kaleido`` is installed, one PNG and one PDF per
+chart, all zipped into ``report.zip``. Bundles are built in a process pool so
+the Streamlit script never blocks on rendering, and are stored under
+``REPORT_DIR/<cache_key(version, selection)>`` so the same selection on the
+same dataset version is only rendered once. The directory is trimmed
+LRU-style to ``REPORT_MAX_BYTES`` after every render, like ``DiskCache``.
+
+Batch mode renders many selections at once::
+
+    python -m engine.report --selection "Valencia,Alicante" --selection "Elche,Gandia"
+    python -m engine.report --batch selecciones.txt     # one comma-separated selection per line
+"""
+import argparse
+import html
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from engine.queries import compare
+from engine.snapshots import cache_key
+
+REPORT_DIR = os.environ.get("EDM_REPORT_DIR", ".cache/reports")
+REPORT_WORKERS = int(os.environ.get("EDM_REPORT_WORKERS", 2))
+REPORT_MAX_BYTES = int(os.environ.get("EDM_REPORT_MAX_BYTES", 256 * 1024 ** 2))
+BUNDLE = "report.zip"
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def report_dir(version: str, municipios, nivel: str = "municipio", root: str = REPORT_DIR) -> str:
+    return os.path.join(root, cache_key(version, "report", nivel, tuple(sorted(municipios))))
+
+
+def _size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(base, nombre))
+               for base, _, ficheros in os.walk(path) for nombre in ficheros)
+
+
+def prune_reports(root: str = REPORT_DIR, max_bytes: int = REPORT_MAX_BYTES):
+    """Remove the least recently used report directories until ``root`` fits
+    in ``max_bytes``. A bundle's mtime is refreshed whenever it is served."""
+    informes = []
+    try:
+        with os.scandir(root) as it:
+            for e in it:
+                if e.name.startswith("tmp"):
+                    continue                    # still being rendered
+                try:
+                    usado = os.stat(os.path.join(e.path, BUNDLE)).st_mtime
+                    informes.append((usado, _size(e.path), e.path))
+                except OSError:
+                    continue
+    except FileNotFoundError:
+        return
+    total = sum(size for _, size, _ in informes)
+    for _, size, path in sorted(informes):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def _has_kaleido() -> bool:
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _summary_html(mejor: dict) -> str:
+    etiquetas = {"indice_oportunidad": "Highest opportunity index",
+                 "centros_por_1000hab": "Most schools /1k inh.",
+                 "viviendas_por_1000hab": "Most housing offers /1k inh.",
+                 "empresas_por_1000hab": "Most companies /1k inh."}
+    filas = "".join(f"<li>{etiquetas[col]}: <b>{html.escape(str(m))}</b></li>"
+                    for col, m in mejor.items() if col in etiquetas)
+    return f"<ul>{filas}</ul>"
+
+
+def render_report(comparacion: dict, version: str, out_dir: str) -> str:
+    """Write the bundle for one ``compare()`` result; returns the zip path.
+
+    Runs inside the worker processes: it only needs the (small) comparison
+    result, never the whole dataset.
+    """
+    from engine.figures import absolute_table, comparator_figures
+
+    bundle = os.path.join(out_dir, BUNDLE)
+    if os.path.exists(bundle):
+        return bundle
+
+    df_sel = comparacion["indicadores"]
+    municipios = df_sel["municipio"].tolist()
+    figuras = comparator_figures(comparacion)
+    imagenes = _has_kaleido()
+
+    os.makedirs(os.path.dirname(out_dir) or ".", exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=os.path.dirname(out_dir) or ".")
+    try:
+        partes = [
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+            f"<title>Comparison: {html.escape(', '.join(municipios))}</title></head><body>",
+            f"<h1>Comparison: {html.escape(', '.join(municipios))}</h1>",
+            f"<p>Dataset version <code>{version}</code></p>",
+            "<h2>Indicators per municipality</h2>", df_sel.set_index("municipio").to_html(),
+            "<h2>Absolute values</h2>", absolute_table(df_sel).to_html(),
+        ]
+        if comparacion["pequenos"]:
+            partes.append("<p><b>Note:</b> fewer than 1000 inhabitants, ratios may be distorted: "
+                          f"{html.escape(', '.join(comparacion['pequenos']))}</p>")
+        partes += ["<h2>Summary</h2>", _summary_html(comparacion["mejor"])]
+
+        seccion = None
+        for i, (titulo, fig) in enumerate(figuras):
+            if titulo != seccion:
+                partes.append(f"<h2>{html.escape(titulo)}</h2>")
+                seccion = titulo
+            # plotly.js is inlined once, so the HTML works offline
+            partes.append(fig.to_html(full_html=False, include_plotlyjs=(i == 0)))
+            if imagenes:
+                os.makedirs(os.path.join(tmp, "figures"), exist_ok=True)
+                for ext in ("png", "pdf"):
+                    fig.write_image(os.path.join(tmp, "figures", f"{i:02d}.{ext}"))
+        partes.append("</body></html>")
+
+        with open(os.path.join(tmp, "report.html"), "w", encoding="utf-8") as f:
+            f.write("\n".join(partes))
+        with zipfile.ZipFile(os.path.join(tmp, BUNDLE), "w", zipfile.ZIP_DEFLATED) as z:
+            for base, _, ficheros in os.walk(tmp):
+                for nombre in ficheros:
+                    if nombre != BUNDLE:
+                        ruta = os.path.join(base, nombre)
+                        z.write(ruta, os.path.relpath(ruta, tmp))
+
+        try:
+            os.replace(tmp, out_dir)
+        except OSError:
+            # another worker finished the same report first
+            shutil.rmtree(tmp, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    # the new bundle is the most recent, so it is never the one evicted
+    prune_reports(os.path.dirname(out_dir) or ".")
+    return bundle
+
+
+def _get_pool(roto: ProcessPoolExecutor | None = None) -> ProcessPoolExecutor:
+    """The shared pool; passing the pool that just broke replaces it."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool is roto:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            # the server is multi-threaded (tornado, refresher, API): forking it
+            # can hand a worker a lock held by another thread, so never fork
+            metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(REPORT_WORKERS, mp_context=multiprocessing.get_context(metodo))
+        return _pool
+
+
+def submit_report(version: str, comparacion: dict, nivel: str = "municipio",
+                  root: str = REPORT_DIR) -> Future:
+    """Schedule the bundle for a ``compare()`` result; already built ones resolve at once."""
+    out_dir = report_dir(version, comparacion["indicadores"]["municipio"], nivel, root)
+    bundle = os.path.join(out_dir, BUNDLE)
+    try:
+        os.utime(bundle)                        # already built: now the most recently used
+    except FileNotFoundError:
+        pass
+    else:
+        futuro = Future()
+        futuro.set_result(bundle)
+        return futuro
+    pool = _get_pool()
+    try:
+        return pool.submit(render_report, comparacion, version, out_dir)
+    except BrokenProcessPool:
+        # a worker died (OOM, segfault in kaleido): start a new pool instead of
+        # failing every export until the process restarts
+        return _get_pool(roto=pool).submit(render_report, comparacion, version, out_dir)
+
+
+def build_batch(dataset, selecciones, root: str = REPORT_DIR) -> list[str]:
+    """Render every selection in parallel; returns the zip paths in order."""
+    futuros = [submit_report(dataset.version,
+                             compare(dataset.df, sel, dataset.catalog.maximos),
+                             root=root)
+               for sel in selecciones]
+    return [f.result() for f in futuros]
+
+
+def main():
+    from engine.refresh import load_dataset
+    from engine.runtime import disk_cache
+
+    parser = argparse.ArgumentParser(description="Static comparator reports (HTML, PNG/PDF with kaleido).")
+    parser.add_argument("--selection", action="append", default=[],
+                        help="comma-separated municipalities (repeatable)")
+    parser.add_argument("--batch", help="file with one comma-separated selection per line")
+    parser.add_argument("--out", default=REPORT_DIR)
+    args = parser.parse_args()
+
+    selecciones = list(args.selection)
+    if args.batch:
+        with open(args.batch, encoding="utf-8") as f:
+            selecciones += [linea for linea in f if linea.strip()]
+    selecciones = [[m.strip() for m in s.split(",") if m.strip()] for s in selecciones]
+    if not selecciones:
+        parser.error("give at least one --selection or a --batch file")
+
+    # same disk tier as the app: the derived indexes are not rebuilt per job
+    dataset = load_dataset(cache=disk_cache())
+    desconocidos = set().union(*selecciones) - set(dataset.df["municipio"])
+    if desconocidos:
+        parser.error(f"unknown municipalities: {', '.join(sorted(desconocidos))}")
+    for sel, ruta in zip(selecciones, build_batch(dataset, selecciones, args.out)):
+        print(f"{', '.join(sel)} -> {ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Process-wide query results with single-flight deduplication.
+
+Every Streamlit session (and the API) in a server process shares one
+``ResultCache``. Keys start with the dataset version, so a refresh makes the
+old entries unreachable and they age out of the LRU. While a key is being
+computed, other callers asking for it wait on the same ``Future`` instead of
+computing it again, so a burst of identical first-page loads costs one
+computation. ``prewarm`` fills the entries behind the default page state as
+soon as a version is loaded.
+
+Cached values are shared between sessions: callers must not mutate them.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from engine.queries import compare, max_dist_bound, school_aggregates, search_minimums
+from engine.robustness import CONCENTRACION, N_MUESTRAS, rank_stability
+
+log = logging.getLogger(__name__)
+
+MAX_ENTRIES = 512
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._done = OrderedDict()
+        self._inflight: dict[tuple, Future] = {}
+
+    def get_or_compute(self, key: tuple, compute):
+        with self._lock:
+            if key in self._done:
+                self._done.move_to_end(key)
+                return self._done[key]
+            futuro = self._inflight.get(key)
+            propio = futuro is None
+            if propio:
+                futuro = self._inflight[key] = Future()
+        if not propio:
+            return futuro.result()
+
+        try:
+            valor = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            futuro.set_exception(e)
+            raise
+        with self._lock:
+            self._done[key] = valor
+            while len(self._done) > self.max_entries:
+                self._done.popitem(last=False)
+            del self._inflight[key]
+        futuro.set_result(valor)
+        return valor
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+
+RESULTS = ResultCache()
+
+
+def cached_search(dataset, min_centros: float = 1.0, min_viviendas: float = 1.0,
+                  min_empresas: float = 100.0, max_dist_km: float | None = None):
+    params = (float(min_centros), float(min_viviendas), float(min_empresas),
+              None if max_dist_km is None else float(max_dist_km))
+    return RESULTS.get_or_compute((dataset.version, "search") + params,
+                                  lambda: search_minimums(dataset.df, *params))
+
+
+def cached_compare(dataset, municipios, nivel: str = "municipio") -> dict:
+    """``compare`` at any roll-up level (aggregates use their own maxima)."""
+    def compute():
+        if nivel == "municipio":
+            return compare(dataset.df, municipios, dataset.catalog.maximos)
+        return compare(dataset.niveles[nivel].rename(columns={nivel: "municipio"}), municipios)
+    return RESULTS.get_or_compute((dataset.version, "compare", nivel, tuple(sorted(municipios))), compute)
+
+
+def cached_schools(dataset, regimen: str):
+    return RESULTS.get_or_compute((dataset.version, "schools", regimen),
+                                  lambda: school_aggregates(dataset, regimen))
+
+
+def cached_rank_stability(dataset, nivel: str = "municipio", n: int = N_MUESTRAS,
+                          concentracion: float | None = CONCENTRACION, normalizar: bool = False):
+    frame = dataset.df if nivel == "municipio" else dataset.niveles[nivel].rename(columns={nivel: "municipio"})
+    return RESULTS.get_or_compute(
+        (dataset.version, "rank_stability", nivel, n, concentracion, normalizar),
+        lambda: rank_stability(frame, n, concentracion, normalizar))
+
+
+def prewarm(dataset):
+    """Compute what a fresh session shows first: the comparator's first two
+    municipalities, the search tab's default sliders and the first regimen."""
+    try:
+        cached_compare(dataset, list(dataset.df["municipio"].unique()[:2]))
+        cached_search(dataset, 1.0, 1.0, 100.0, max_dist_bound(dataset.catalog))
+        cached_search(dataset)          # API defaults (no distance limit)
+        regimenes = sorted(dataset.centros_df["regimen"].dropna().unique())
+        if regimenes:
+            cached_schools(dataset, regimenes[0])
+    except Exception:
+        log.exception("Pre-warming the result cache failed")
@@ -0,0 +1,106 @@
+"""How much the opportunity ranking depends on the 40/30/30 weights.
+
+Weight vectors are drawn from a Dirichlet distribution (centred on the
+official weights, or flat over all weightings) and municipalities are scored
+a block of samples at a time, ``X @ W.T``; ranks come from one ``argsort`` per
+column and are folded into a municipality x rank histogram, so memory does
+not grow with the number of samples. Quantiles are read off the histogram.
+The result keeps a per-municipality summary of the rank distribution plus the
+samples, so "who wins among these" for any selection is another small
+product. Cached per dataset version and sampling configuration by the caller.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from engine.hierarchy import PESOS_INDICE
+
+RATIOS = list(PESOS_INDICE)
+N_MUESTRAS = 2000
+# Dirichlet concentration around the official weights; None = flat (any weighting)
+CONCENTRACION = 20.0
+CUANTILES = (0.05, 0.5, 0.95)
+# scores + argsort of one block of samples stay around this size
+BLOQUE_BYTES = 64 * 1024 ** 2
+
+
+@dataclass(frozen=True)
+class RankStability:
+    municipios: np.ndarray
+    x: np.ndarray               # ratios, one row per municipality
+    pesos: np.ndarray           # sampled weights, one row per sample
+    resumen: pd.DataFrame       # rank distribution per municipality
+
+    def win_share(self, municipios) -> pd.Series:
+        """Share of the samples in which each of ``municipios`` scores highest among them."""
+        fila = {m: i for i, m in enumerate(self.municipios)}
+        elegidos = [m for m in municipios if m in fila]
+        if not elegidos:
+            return pd.Series(dtype=float, name="p_mejor")
+        puntos = self.x[[fila[m] for m in elegidos]] @ self.pesos.T
+        ganador = np.bincount(puntos.argmax(axis=0), minlength=len(elegidos))
+        return pd.Series(ganador / self.pesos.shape[0], index=elegidos, name="p_mejor")
+
+
+def sample_weights(n: int = N_MUESTRAS, concentracion: float | None = CONCENTRACION,
+                   seed: int = 0) -> np.ndarray:
+    base = np.array([PESOS_INDICE[c] for c in RATIOS])
+    alpha = np.ones_like(base) if concentracion is None else base * concentracion
+    return np.random.default_rng(seed).dirichlet(alpha, n)
+
+
+def _rank_histogram(x: np.ndarray, pesos: np.ndarray) -> np.ndarray:
+    """``hist[m, r]``: samples in which municipality ``m`` ranks ``r + 1``."""
+    filas = len(x)
+    hist = np.zeros((filas, filas), dtype=np.min_scalar_type(len(pesos)))
+    posiciones = np.arange(filas)
+    bloque = max(1, BLOQUE_BYTES // (12 * filas))      # float32 scores + int64 order
+    for i in range(0, len(pesos), bloque):
+        puntos = (pesos[i:i + bloque] @ x.T).astype(np.float32)    # samples x municipalities
+        # one permutation per sample: orden[s, r] ranks r + 1, no repeated (m, r) pairs
+        for orden in np.argsort(-puntos, axis=1):
+            hist[orden, posiciones] += 1
+    return hist
+
+
+def _hist_quantiles(hist: np.ndarray, n: int) -> list[np.ndarray]:
+    """``np.quantile(ranks, CUANTILES, axis=1)`` (linear method) from the
+    histogram, which is turned into its running sum in place."""
+    acumulado = np.cumsum(hist, axis=1, out=hist)
+
+    def k_esimo(k):                                     # k-th smallest rank, 0-based
+        return (acumulado <= k).sum(axis=1) + 1
+    resultado = []
+    for q in CUANTILES:
+        h = q * (n - 1)
+        k = int(np.floor(h))
+        bajo = k_esimo(k)
+        alto = k_esimo(min(k + 1, n - 1))
+        resultado.append(bajo + (h - k) * (alto - bajo))
+    return resultado
+
+
+def rank_stability(df: pd.DataFrame, n: int = N_MUESTRAS,
+                   concentracion: float | None = CONCENTRACION, normalizar: bool = False,
+                   seed: int = 0) -> RankStability:
+    """``normalizar`` divides each ratio by its maximum first; the index itself
+    uses raw ratios, where companies per 1000 inh. (hundreds) dominate."""
+    datos = df.dropna(subset=RATIOS)
+    crudos = datos[RATIOS].to_numpy(dtype=np.float64)
+    x = crudos
+    if normalizar:
+        x = crudos / np.where(crudos.max(axis=0) > 0, crudos.max(axis=0), 1)
+    pesos = sample_weights(n, concentracion, seed)
+
+    hist = _rank_histogram(x, pesos)
+    p_top1, p_top10 = hist[:, 0] / n, hist[:, :10].sum(axis=1) / n
+    q = _hist_quantiles(hist, n)
+    # the published index (raw ratios, 40/30/30), whatever the sampling scale
+    oficial = crudos @ np.array([PESOS_INDICE[c] for c in RATIOS])
+    resumen = pd.DataFrame({
+        "municipio": datos["municipio"].to_numpy(),
+        "rango_base": pd.Series(-oficial).rank(method="min").astype(int).to_numpy(),
+        "rango_p5": q[0], "rango_mediana": q[1], "rango_p95": q[2],
+        "p_top1": p_top1, "p_top10": p_top10})
+    return RankStability(datos["municipio"].to_numpy(), x, pesos, resumen)
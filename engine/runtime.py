@@ -0,0 +1,67 @@
+"""Process-wide engine state, initialized once.
+
+The disk cache, the refreshing ``DatasetStore`` (with result pre-warming and
+the optional HTTP API) and the time-series store live here instead of in a
+Streamlit script. Every entry point (``app.py``, ``app_prueba1.py``, batch
+jobs, a Python shell) shares one instance per process, and nothing needs a
+Streamlit rerun to be imported or tested.
+
+Locks are only taken to create each singleton (one lock per singleton, so a
+slow first series parse never blocks dataset reads); afterwards every
+accessor is a plain attribute read, and reloads happen in background threads.
+"""
+import os
+import threading
+
+from engine.api import start_in_thread
+from engine.diskcache import DiskCache
+from engine.refresh import Dataset, DatasetStore
+from engine.resultcache import prewarm
+from engine.snapshots import SnapshotManager
+from engine.timeseries import SeriesStore, SeriesWatcher
+
+_disk_lock = threading.Lock()
+_store_lock = threading.Lock()
+_series_lock = threading.Lock()
+_disk: DiskCache | None = None
+_store: DatasetStore | None = None
+_series: SeriesWatcher | None = None
+
+
+def disk_cache() -> DiskCache:
+    global _disk
+    if _disk is None:
+        with _disk_lock:
+            if _disk is None:
+                _disk = DiskCache()
+    return _disk
+
+
+def store() -> DatasetStore:
+    """Started on first use; a background thread reloads the CSVs when they change
+    and every new version pre-warms the default queries."""
+    global _store
+    if _store is None:
+        cache = disk_cache()
+        with _store_lock:
+            if _store is None:
+                nuevo = DatasetStore(snapshots=SnapshotManager(), cache=cache, on_version=prewarm).start()
+                # optional headless API for internal services, same data as the UI
+                if os.environ.get("EDM_API_PORT"):
+                    start_in_thread(nuevo, port=int(os.environ["EDM_API_PORT"]))
+                _store = nuevo
+    return _store
+
+
+def current() -> Dataset:
+    return store().current()
+
+
+def series() -> tuple[tuple, SeriesStore | None]:
+    """(signature, store) of the monthly extracts, swapped in by a background thread."""
+    global _series
+    if _series is None:
+        with _series_lock:
+            if _series is None:
+                _series = SeriesWatcher().start()
+    return _series.current()
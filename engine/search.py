@@ -0,0 +1,97 @@
+"""Typo-tolerant name lookup.
+
+``FuzzyIndex`` keeps a trigram inverted index over folded names (see
+``engine.text.fold``). A query gathers candidates by shared trigrams in one
+``bincount`` over the posting lists, then ranks the top few by edit distance
+against the start of any word, so "valen", "castellon" or "alcudia" find
+"valencia", "castello de la plana" and "l'alcudia". Bilingual names such as
+"alacant/alicante" are indexed under both forms. Built once per dataset version
+and pickled with it, so it answers in milliseconds even for the ~8k Spanish
+municipalities.
+"""
+from collections import defaultdict
+from collections.abc import Iterable
+
+import numpy as np
+
+from engine.text import fold
+
+CANDIDATOS = 32     # candidates re-ranked by edit distance per query
+
+
+def trigrams(s: str) -> set[str]:
+    s = f"  {s} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+def word_distance(consulta: str, nombre: str) -> int:
+    """Edit distance from ``consulta`` to the closest prefix of any word-initial
+    suffix of ``nombre`` (one DP pass: matching may start free at word starts)."""
+    previa = [0]
+    for d in nombre:
+        # free at a word start, otherwise skipping name characters costs one each
+        previa.append(0 if d == " " else previa[-1] + 1)
+    for i, c in enumerate(consulta, 1):
+        fila = [i]
+        for j, d in enumerate(nombre, 1):
+            fila.append(min(previa[j] + 1, fila[j - 1] + 1, previa[j - 1] + (c != d)))
+        previa = fila
+    return min(previa)
+
+
+def query_distance(consulta: str, nombre: str) -> int:
+    """``word_distance`` of the whole query, or of each query word on its own
+    (in any order, other words skipped) when that is closer."""
+    dist = word_distance(consulta, nombre)
+    palabras = consulta.split()
+    if len(palabras) > 1:
+        dist = min(dist, sum(word_distance(p, nombre) for p in palabras))
+    return dist
+
+
+class FuzzyIndex:
+    """Trigram index over ``nombres``; ``search`` returns positions into it."""
+
+    def __init__(self, nombres: Iterable[str], separador: str = "/"):
+        self.nombres = list(nombres)
+        # repeated names (e.g. many "CEIP LLUIS VIVES") share one form
+        unicas = {}
+        for pos, nombre in enumerate(self.nombres):
+            for parte in str(nombre).split(separador) if separador else [nombre]:
+                forma = fold(parte)
+                if forma:
+                    unicas.setdefault(forma, []).append(pos)
+        self.formas = list(unicas)
+        self.destino = list(unicas.values())
+        postings = defaultdict(list)
+        for i, forma in enumerate(self.formas):
+            for g in trigrams(forma):
+                postings[g].append(i)
+        self.postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+
+    def search(self, consulta: str, limit: int = 10) -> list[int]:
+        q = fold(consulta)
+        if not q or not self.formas:
+            return []
+        listas = [self.postings[g] for g in trigrams(q) if g in self.postings]
+        if not listas:
+            return []
+        comunes = np.bincount(np.concatenate(listas), minlength=len(self.formas))
+        n = min(CANDIDATOS, int((comunes > 0).sum()))
+        candidatos = np.argpartition(-comunes, n - 1)[:n]
+
+        # about one typo every four characters
+        tolerancia = max(1, len(q) // 4)
+        mejores = {}
+        for i in candidatos:
+            dist = query_distance(q, self.formas[i])
+            if dist > tolerancia:
+                continue
+            clave = (dist, -comunes[i], len(self.formas[i]))
+            for pos in self.destino[i]:
+                if pos not in mejores or clave < mejores[pos]:
+                    mejores[pos] = clave
+        return sorted(mejores, key=mejores.get)[:limit]
+
+    def names(self, consulta: str, limit: int = 10) -> list[str]:
+        return [self.nombres[i] for i in self.search(consulta, limit)]
@@ -0,0 +1,53 @@
+"""Nearest neighbours in the standardized indicator space.
+
+The index is built once per dataset version: features are z-scored
+(population on a log scale, it spans four orders of magnitude) and their
+squared norms kept, so a query is one matrix-vector product over all rows
+instead of a full distance matrix.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+FEATURES = [
+    "centros_por_1000hab",
+    "viviendas_por_1000hab",
+    "empresas_por_1000hab",
+    "Poblacion_Total",
+    "indice_oportunidad"]
+
+
+@dataclass(frozen=True)
+class NeighborIndex:
+    municipios: np.ndarray
+    z: np.ndarray           # standardized features, one row per municipality
+    z2: np.ndarray          # z ** 2, for the weighted norm trick
+    posicion: dict[str, int]
+
+    def query(self, municipio: str, k: int = 5, weights=None) -> pd.DataFrame:
+        """The ``k`` municipalities closest to ``municipio`` (itself excluded)."""
+        i = self.posicion.get(municipio)
+        if i is None or k <= 0:
+            return pd.DataFrame(columns=["municipio", "distancia"])
+        w = np.ones(self.z.shape[1]) if weights is None else np.asarray(weights, dtype=float)
+        q = self.z[i]
+        # ||z - q||_w^2 = sum(w z^2) - 2 sum(w z q) + sum(w q^2)
+        d2 = self.z2 @ w - 2 * (self.z @ (w * q)) + (w * q * q).sum()
+        d2[i] = np.inf
+        k = min(k, len(d2) - 1)
+        top = np.argpartition(d2, k - 1)[:k]
+        top = top[np.argsort(d2[top])]
+        return pd.DataFrame({"municipio": self.municipios[top],
+                             "distancia": np.sqrt(np.maximum(d2[top], 0))})
+
+
+def build_index(df: pd.DataFrame) -> NeighborIndex:
+    datos = df.dropna(subset=FEATURES)
+    x = datos[FEATURES].to_numpy(dtype=float, copy=True)  # written in place below
+    x[:, FEATURES.index("Poblacion_Total")] = np.log1p(x[:, FEATURES.index("Poblacion_Total")])
+    std = x.std(axis=0)
+    z = (x - x.mean(axis=0)) / np.where(std > 0, std, 1)
+    municipios = datos["municipio"].to_numpy()
+    return NeighborIndex(municipios, z, z ** 2,
+                         {m: i for i, m in enumerate(municipios)})
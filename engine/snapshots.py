@@ -0,0 +1,124 @@
+"""Content-addressed dataset snapshots.
+
+Each loaded version of the CSVs gets a ``version`` (hash of the file bytes).
+The last N versions are written as one ``.npy`` file per numeric column and
+read back memory-mapped, so several server processes share the same pages
+and every downstream cache can use the version as its key.
+"""
+import hashlib
+import os
+import pickle
+import shutil
+from collections import OrderedDict
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR = os.environ.get("EDM_SNAPSHOT_DIR", ".cache/snapshots")
+TABLES = ("df", "centros_df")
+
+
+def content_hash(*blobs: bytes) -> str:
+    h = hashlib.blake2b(digest_size=8)
+    for b in blobs:
+        h.update(len(b).to_bytes(8, "little"))
+        h.update(b)
+    return h.hexdigest()
+
+
+def cache_key(version: str, *params) -> str:
+    """Key for anything derived from a dataset version plus some parameters."""
+    return content_hash(version.encode(), repr(params).encode())
+
+
+def _write_frame(frame: pd.DataFrame, path: str):
+    os.makedirs(path, exist_ok=True)
+    objetos = {}
+    for i, col in enumerate(frame.columns):
+        values = frame[col].to_numpy()
+        if values.dtype.kind in "biuf":
+            np.save(os.path.join(path, f"{i}.npy"), values)
+        else:
+            objetos[i] = values.astype(object)
+    with open(os.path.join(path, "meta.pkl"), "wb") as f:
+        pickle.dump({"columns": list(frame.columns), "objects": objetos}, f)
+
+
+def _read_frame(path: str) -> pd.DataFrame:
+    with open(os.path.join(path, "meta.pkl"), "rb") as f:
+        meta = pickle.load(f)
+    data = {}
+    for i, col in enumerate(meta["columns"]):
+        if i in meta["objects"]:
+            data[col] = meta["objects"][i]
+        else:
+            data[col] = np.load(os.path.join(path, f"{i}.npy"), mmap_mode="r")
+    return pd.DataFrame(data, copy=False)
+
+
+class SnapshotManager:
+    """Keeps the last ``keep`` dataset versions on disk and memory-mapped."""
+
+    def __init__(self, root: str = SNAPSHOT_DIR, keep: int = 3):
+        self.root = root
+        self.keep = keep
+        self._snapshots = OrderedDict()     # version -> Dataset (oldest first)
+        self._schema = {}                   # version -> schema it was written with
+        self._prune()
+
+    def get(self, version: str):
+        return self._snapshots.get(version)
+
+    def versions(self) -> list[str]:
+        return list(self._snapshots)
+
+    def _dir(self, version: str) -> str:
+        return os.path.join(self.root, f"{version}.s{self._schema[version]}")
+
+    def _prune(self):
+        """Keep the ``keep`` most recently published directories under ``root``.
+
+        Works on the directory listing rather than on this process's versions,
+        so snapshots left by earlier runs or other workers are trimmed too."""
+        try:
+            entradas = [e for e in os.scandir(self.root)
+                        if e.is_dir() and ".tmp" not in e.name]
+        except FileNotFoundError:
+            return
+        entradas.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        for e in entradas[self.keep:]:
+            shutil.rmtree(e.path, ignore_errors=True)
+
+    def register(self, dataset, schema: int = 0):
+        """Persist ``dataset`` (if new) and return the memory-mapped copy.
+
+        ``schema`` (``refresh.SCHEMA_VERSION``) is part of the directory name:
+        frames written by code with another loading convention are not reused."""
+        if dataset.version in self._snapshots:
+            self._snapshots.move_to_end(dataset.version)
+            return self._snapshots[dataset.version]
+
+        self._schema[dataset.version] = schema
+        path = self._dir(dataset.version)
+        if not os.path.isdir(path):
+            tmp = f"{path}.tmp{os.getpid()}"
+            for name in TABLES:
+                _write_frame(getattr(dataset, name), os.path.join(tmp, name))
+            try:
+                os.replace(tmp, path)
+            except OSError:
+                # another process published the same version first
+                shutil.rmtree(tmp, ignore_errors=True)
+        else:
+            os.utime(path)                  # reused: counts as the newest for _prune
+
+        mapped = replace(dataset, **{name: _read_frame(os.path.join(path, name))
+                                     for name in TABLES})
+        self._snapshots[dataset.version] = mapped
+        while len(self._snapshots) > self.keep:
+            viejo, _ = self._snapshots.popitem(last=False)
+            del self._schema[viejo]
+        # frames already mapped stay readable after their files are unlinked
+        self._prune()
+        return mapped
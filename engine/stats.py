@@ -0,0 +1,125 @@
+"""Statistics catalog computed once per dataset version.
+
+Every tab used to recompute min/max/means on each rerun; they now read the
+precomputed values from a ``StatsCatalog``.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+INDICADORES = [
+    "centros_por_1000hab",
+    "viviendas_por_1000hab",
+    "empresas_por_1000hab",
+    "indice_oportunidad",
+    # from the accessibility pipeline, when it has been run
+    "dist_centro_km",
+    "dist_media_centros_km"]
+
+# Deciles: enough resolution for the quantile colour scale and the legend ticks
+QUANTILE_LEVELS = tuple(np.linspace(0, 1, 11).round(2))
+HIST_BINS = 20
+
+
+@dataclass(frozen=True)
+class BBox:
+    lat_min: float
+    lat_max: float
+    lon_min: float
+    lon_max: float
+    lat_mean: float
+    lon_mean: float
+
+
+@dataclass(frozen=True)
+class ColumnStats:
+    count: int
+    min: float
+    max: float
+    mean: float
+    quantiles: tuple[float, ...]
+    hist_counts: tuple[int, ...]
+    hist_edges: tuple[float, ...]
+    bbox: BBox | None = None
+
+
+@dataclass(frozen=True)
+class RegimenStats:
+    n_centros: int
+    bbox: BBox
+    centros_por_localidad: ColumnStats
+
+
+@dataclass(frozen=True)
+class StatsCatalog:
+    indicadores: dict[str, ColumnStats]
+    regimenes: dict[str, RegimenStats]
+    # comarca / provincia roll-ups, same shape as ``indicadores``
+    niveles: dict[str, dict[str, ColumnStats]] = field(default_factory=dict)
+
+    @property
+    def maximos(self) -> pd.Series:
+        """Column maxima, same shape as ``df[INDICADORES].max()``."""
+        return pd.Series({k: s.max for k, s in self.indicadores.items()})
+
+
+def bbox_of(lat: pd.Series, lon: pd.Series) -> BBox:
+    return BBox(float(lat.min()), float(lat.max()),
+                float(lon.min()), float(lon.max()),
+                float(lat.mean()), float(lon.mean()))
+
+
+def column_stats(values: pd.Series, bbox: BBox | None = None) -> ColumnStats:
+    v = values.dropna().to_numpy(dtype=float)
+    if len(v) == 0:
+        nan = float("nan")
+        return ColumnStats(0, nan, nan, nan, (), (), (), bbox)
+    counts, edges = np.histogram(v, bins=HIST_BINS)
+    return ColumnStats(
+        count=len(v),
+        min=float(v.min()),
+        max=float(v.max()),
+        mean=float(v.mean()),
+        quantiles=tuple(float(q) for q in np.quantile(v, QUANTILE_LEVELS)),
+        hist_counts=tuple(int(c) for c in counts),
+        hist_edges=tuple(float(e) for e in edges),
+        bbox=bbox)
+
+
+def indicator_stats(df: pd.DataFrame) -> dict[str, ColumnStats]:
+    indicadores = {}
+    for ind in INDICADORES:
+        if ind not in df.columns:
+            continue
+        # same row set the map uses (rows with coordinates and a value)
+        valid = df.dropna(subset=["lat", "lon", ind])
+        indicadores[ind] = column_stats(valid[ind], bbox_of(valid["lat"], valid["lon"]))
+    return indicadores
+
+
+def build_catalog(df: pd.DataFrame, centros_df: pd.DataFrame,
+                  niveles: dict[str, pd.DataFrame] | None = None) -> StatsCatalog:
+    indicadores = indicator_stats(df)
+
+    regimenes = {}
+    for regimen, grupo in centros_df.dropna(subset=["regimen"]).groupby("regimen"):
+        por_localidad = grupo.groupby("localidad")["DENOMINACION"].count()
+        regimenes[regimen] = RegimenStats(
+            n_centros=len(grupo),
+            bbox=bbox_of(grupo["LATITUD"], grupo["LONGITUD"]),
+            centros_por_localidad=column_stats(por_localidad))
+
+    agregados = {nivel: indicator_stats(frame)
+                 for nivel, frame in (niveles or {}).items() if nivel != "municipio"}
+    return StatsCatalog(indicadores, regimenes, agregados)
+
+
+def quantile_position(values, stats: ColumnStats) -> np.ndarray:
+    """Map values to [0, 1] through the piecewise-linear empirical CDF."""
+    # np.interp needs strictly increasing x; collapse repeated quantiles
+    qs, idx = np.unique(np.asarray(stats.quantiles), return_index=True)
+    levels = np.asarray(QUANTILE_LEVELS)[idx]
+    if len(qs) < 2:
+        return np.zeros(len(values))
+    return np.interp(np.asarray(values, dtype=float), qs, levels)
@@ -0,0 +1,12 @@
+"""Name normalization shared by every join and search on place names."""
+import re
+import unicodedata
+
+_NO_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def fold(nombre: str) -> str:
+    """Lowercase, strip accents and punctuation: "L'Alcúdia" -> "l alcudia"."""
+    s = unicodedata.normalize("NFKD", str(nombre).lower())
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    return _NO_ALNUM.sub(" ", s).strip()
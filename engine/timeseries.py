@@ -0,0 +1,254 @@
+"""Monthly indicator extracts as a compact, sliceable store.
+
+Extracts live in ``data/series/indicadores_YYYY-MM.csv`` (same columns as
+``indicadores_municipios.csv``). They are parsed once into a compressed
+``.npz``: one municipality x period matrix per column, integer counts
+delta-encoded along time (consecutive months barely change, so the zlib
+stream shrinks a lot). Later months are appended without re-reading the
+old CSVs, and slices by municipality x date range are plain array indexing.
+
+    python -m engine.timeseries            # (re)build the store
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+SERIES_DIR = "data/series"
+SERIES_STORE = os.environ.get("EDM_SERIES_STORE", ".cache/series.npz")
+_PERIODO = re.compile(r"indicadores_(\d{4}-\d{2})\.csv$")
+
+# counts: integers, delta-encoded; the rest are stored as float32
+CONTEOS = ["Poblacion_Total", "n_centros_total", "total_ofertas", "empresas_total"]
+RATIOS = ["centros_por_1000hab", "viviendas_por_1000hab", "empresas_por_1000hab", "indice_oportunidad"]
+COLUMNAS = CONTEOS + RATIOS
+
+
+def list_extracts(series_dir: str = SERIES_DIR) -> dict[str, str]:
+    """period -> path, sorted by period."""
+    found = {}
+    for path in glob.glob(os.path.join(series_dir, "indicadores_*.csv")):
+        m = _PERIODO.search(os.path.basename(path))
+        if m:
+            found[m.group(1)] = path
+    return dict(sorted(found.items()))
+
+
+def _manifest(extracts: dict[str, str]) -> dict[str, list]:
+    return {p: [os.path.getsize(f), os.stat(f).st_mtime_ns] for p, f in extracts.items()}
+
+
+class SeriesStore:
+    def __init__(self, municipios, periodos, valores: dict[str, np.ndarray], manifest=None):
+        self.municipios = np.asarray(municipios, dtype=object)
+        self.periodos = list(periodos)
+        self.valores = valores              # column -> (n_municipios, n_periodos) float
+        self.manifest = manifest or {}
+        self._pos = {m: i for i, m in enumerate(self.municipios)}
+        self._frames = {}
+
+    # storage
+    @classmethod
+    def load(cls, path: str = SERIES_STORE) -> "SeriesStore":
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(str(z["meta"]))
+            valores = {}
+            for col in COLUMNAS:
+                if col in CONTEOS:
+                    # undo the delta encoding; missing values come from the __nulo masks
+                    abs_ = np.cumsum(z[col], axis=1).astype(float)
+                    abs_[z[f"{col}__nulo"]] = np.nan
+                    valores[col] = abs_
+                else:
+                    valores[col] = z[col].astype(float)
+        return cls(meta["municipios"], meta["periodos"], valores, meta["manifest"])
+
+    def save(self, path: str = SERIES_STORE):
+        arrays = {"meta": np.array(json.dumps({
+            "municipios": self.municipios.tolist(), "periodos": self.periodos,
+            "manifest": self.manifest}))}
+        for col in COLUMNAS:
+            v = self.valores[col]
+            if col in CONTEOS:
+                nulo = np.isnan(v)
+                entero = np.where(nulo, 0, v).astype(np.int64)
+                arrays[col] = np.diff(entero, axis=1, prepend=0)
+                arrays[f"{col}__nulo"] = nulo
+            else:
+                arrays[col] = v.astype(np.float32)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp, path)
+
+    # building
+    @classmethod
+    def empty(cls) -> "SeriesStore":
+        return cls([], [], {c: np.empty((0, 0)) for c in COLUMNAS})
+
+    def append(self, periodo: str, extract: pd.DataFrame):
+        nuevos = [m for m in extract["municipio"].unique() if m not in self._pos]
+        if nuevos:
+            self.municipios = np.concatenate([self.municipios, np.asarray(nuevos, dtype=object)])
+            self._pos = {m: i for i, m in enumerate(self.municipios)}
+            for col in COLUMNAS:
+                relleno = np.full((len(nuevos), len(self.periodos)), np.nan)
+                self.valores[col] = np.vstack([self.valores[col], relleno])
+        filas = extract["municipio"].map(self._pos).to_numpy()
+        for col in COLUMNAS:
+            columna = np.full((len(self.municipios), 1), np.nan)
+            if col in extract.columns:
+                columna[filas, 0] = extract[col].to_numpy(dtype=float)
+            self.valores[col] = np.hstack([self.valores[col], columna])
+        self.periodos.append(periodo)
+        self._frames.clear()
+
+    # queries
+    def slice(self, columna: str, municipios=None, desde: str | None = None,
+              hasta: str | None = None) -> pd.DataFrame:
+        """Wide frame: one row per municipality, one column per period."""
+        cols = [i for i, p in enumerate(self.periodos)
+                if (desde is None or p >= desde) and (hasta is None or p <= hasta)]
+        if municipios is None:
+            filas = np.arange(len(self.municipios))
+        else:
+            filas = np.array([self._pos[m] for m in municipios if m in self._pos], dtype=int)
+        return pd.DataFrame(self.valores[columna][np.ix_(filas, cols)],
+                            index=pd.Index(self.municipios[filas], name="municipio"),
+                            columns=[self.periodos[i] for i in cols])
+
+    def long(self, columna: str, municipios=None, desde=None, hasta=None) -> pd.DataFrame:
+        """Tidy frame (municipio, periodo, value) for line charts."""
+        wide = self.slice(columna, municipios, desde, hasta)
+        return (wide.reset_index()
+                .melt(id_vars="municipio", var_name="periodo", value_name=columna))
+
+    def frames(self, columna: str) -> np.ndarray:
+        """Map colours for every period, (n_periodos, n_municipios, 4) uint8.
+
+        Normalized by the maximum over the whole series so frames are
+        comparable; computed once per column and reused by every session.
+        """
+        if columna not in self._frames:
+            v = self.valores[columna]
+            tope = np.nanmax(v) if np.isfinite(v).any() else 1.0
+            t = np.nan_to_num(v / (tope or 1.0)).T
+            rgba = np.empty(t.shape + (4,), dtype=np.uint8)
+            rgba[..., 0] = 255 * t
+            rgba[..., 1] = 255 * (1 - t)
+            rgba[..., 2] = 100
+            rgba[..., 3] = np.where(np.isnan(v.T), 0, 180)
+            self._frames[columna] = rgba
+        return self._frames[columna]
+
+
+def ensure_store(series_dir: str = SERIES_DIR, path: str = SERIES_STORE) -> SeriesStore | None:
+    """Load the store, reading only the extracts it has not seen yet."""
+    extracts = list_extracts(series_dir)
+    if not extracts:
+        return None
+    manifest = _manifest(extracts)
+    store = None
+    if os.path.exists(path):
+        store = SeriesStore.load(path)
+        if store.manifest == manifest:
+            return store
+        # a past month was rewritten, or deleted: start over
+        if any(store.manifest.get(p) != m for p, m in manifest.items() if p in store.manifest) \
+                or set(store.manifest) - set(manifest):
+            store = None
+    if store is None:
+        store = SeriesStore.empty()
+    for periodo, fichero in extracts.items():
+        if periodo in store.manifest:
+            continue
+        if store.periodos and periodo < store.periodos[-1]:
+            # an older month arrived late: appending would break the time order
+            return _rebuild(extracts, manifest, path)
+        store.append(periodo, pd.read_csv(fichero))
+    store.manifest = manifest
+    store.save(path)
+    return store
+
+
+def _rebuild(extracts, manifest, path) -> SeriesStore:
+    store = SeriesStore.empty()
+    for periodo, fichero in extracts.items():
+        store.append(periodo, pd.read_csv(fichero))
+    store.manifest = manifest
+    store.save(path)
+    return store
+
+
+def series_signature(series_dir: str = SERIES_DIR) -> tuple:
+    """Cheap key for callers that cache the loaded store."""
+    return tuple(sorted(_manifest(list_extracts(series_dir)).items()))
+
+
+class SeriesWatcher:
+    """Current ``(signature, store)``, reloaded in a background thread when the
+    extracts change (like ``refresh.DatasetStore``): readers never parse CSVs."""
+
+    def __init__(self, series_dir: str = SERIES_DIR, path: str = SERIES_STORE, interval: float = 5.0):
+        self.series_dir = series_dir
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        firma = series_signature(series_dir)
+        self._actual = (firma, ensure_store(series_dir, path))
+
+    def current(self) -> tuple[tuple, SeriesStore | None]:
+        # a single attribute read: signature and store always match
+        return self._actual
+
+    def refresh(self) -> bool:
+        try:
+            firma = series_signature(self.series_dir)
+            if firma == self._actual[0]:
+                return False
+            self._actual = (firma, ensure_store(self.series_dir, self.path))
+        except Exception:
+            log.exception("Series refresh failed, keeping the current store")
+            return False
+        log.info("Series store refreshed")
+        return True
+
+    def start(self) -> "SeriesWatcher":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="series-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the indicator time-series store.")
+    parser.add_argument("--series-dir", default=SERIES_DIR)
+    parser.add_argument("--out", default=SERIES_STORE)
+    args = parser.parse_args()
+    store = ensure_store(args.series_dir, args.out)
+    if store is None:
+        print(f"no extracts found in {args.series_dir}")
+    else:
+        print(f"{len(store.municipios)} municipalities x {len(store.periodos)} periods -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Load generator: many concurrent Streamlit sessions against app.py.
+
+Starts the app locally (or targets ``--url``), opens N sessions over the
+Streamlit websocket protocol (``/_stcore/stream``, protobuf BackMsg /
+ForwardMsg) and replays an interaction script across the five tabs. For
+every concurrency level it reports rerun latency percentiles, throughput
+and the server's CPU and RSS, one JSON object per line:
+
+    python loadtest.py --levels 1,5,10,25 --duration 30 --out loadtest.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+WIDGETS = ("selectbox", "radio", "slider", "checkbox", "multiselect", "select_slider")
+
+# (widget label, value or callable(options) -> value); one step = one rerun
+ESCENARIO = [
+    ("Select up to 3 municipalities to compare:", lambda opts: random.sample(opts, 3)),
+    ("🔁 Show real values (not normalized)", True),
+    ("Select an indicator for the map", lambda opts: random.choice(opts)),
+    ("Colour scale:", "Quantile"),
+    ("Select the center type:", lambda opts: random.choice(opts)),
+    ("Select map detail level:", "🔎 Detailed view by center"),
+    ("Minimum educational centers per 1000 inhabitants:", lambda opts: round(random.uniform(0, 3), 1)),
+    ("Minimum companies per 1000 inhabitants:", lambda opts: float(random.randrange(0, 600, 50))),
+]
+
+
+class ScriptError(Exception):
+    """The rerun finished, but the script raised (an exception element was sent)."""
+
+
+class Session:
+    def __init__(self, url: str):
+        self.url = url
+        self.widgets = {}       # label -> (kind, id, options)
+        self.states = {}        # id -> WidgetState
+        self.errores = []       # exception messages of the current rerun
+
+    async def __aenter__(self):
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"],
+                                           max_size=None, open_timeout=30)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.ws.close()
+
+    async def rerun(self) -> float:
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        self.errores = []
+        t0 = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                self._register(fwd.delta.new_element)
+            elif kind == "script_finished":
+                if self.errores:
+                    raise ScriptError(self.errores[0])
+                return time.perf_counter() - t0
+
+    def _register(self, el):
+        kind = el.WhichOneof("type")
+        if kind == "exception":
+            self.errores.append(f"{el.exception.type}: {el.exception.message}")
+        elif kind in WIDGETS:
+            w = getattr(el, kind)
+            self.widgets[w.label] = (kind, w.id, list(getattr(w, "options", [])))
+
+    def set(self, label: str, value):
+        if label not in self.widgets:
+            return False
+        kind, wid, options = self.widgets[label]
+        if callable(value):
+            value = value(options)
+        ws = WidgetState(id=wid)
+        if kind == "checkbox":
+            ws.bool_value = bool(value)
+        elif kind in ("selectbox", "radio"):
+            ws.string_value = str(value)
+        elif kind == "multiselect":
+            ws.string_array_value.data[:] = [str(v) for v in value]
+        elif kind == "select_slider":
+            ws.string_array_value.data[:] = [str(value)]
+        else:
+            ws.double_array_value.data[:] = [float(value)]
+        self.states[wid] = ws
+        return True
+
+
+async def _measure(s: Session, latencias: list, errores: list):
+    """One rerun: a latency sample, or an error when the script raised."""
+    try:
+        latencias.append(await s.rerun())
+    except ScriptError as e:
+        errores.append(repr(e))
+
+
+async def _user(url: str, until: float, latencias: list, errores: list):
+    try:
+        async with Session(url) as s:
+            await _measure(s, latencias, errores)
+            while time.monotonic() < until:
+                for label, value in ESCENARIO:
+                    if time.monotonic() >= until:
+                        return
+                    if s.set(label, value):
+                        await _measure(s, latencias, errores)
+    except Exception as e:
+        errores.append(repr(e))
+
+
+def _stat(pid: int) -> list[str]:
+    """Fields of /proc/<pid>/stat after the command name (state is [0], ppid [1])."""
+    with open(f"/proc/{pid}/stat") as f:
+        return f.read().rsplit(")", 1)[1].split()
+
+
+def _descendants(pid: int) -> list[int]:
+    hijos = {}
+    for entrada in os.listdir("/proc"):
+        if entrada.isdigit():
+            try:
+                hijos.setdefault(int(_stat(int(entrada))[1]), []).append(int(entrada))
+            except (OSError, IndexError):
+                pass            # exited while scanning
+    pendientes, todos = [pid], []
+    while pendientes:
+        for hijo in hijos.get(pendientes.pop(), []):
+            todos.append(hijo)
+            pendientes.append(hijo)
+    return todos
+
+
+def _proc_sample(pid: int) -> tuple[float, int]:
+    """(cpu seconds, rss bytes) of a process and its live descendants (e.g. the
+    report worker pool), from /proc. CPU also counts children already reaped."""
+    tick = os.sysconf("SC_CLK_TCK")
+    pagina = os.sysconf("SC_PAGE_SIZE")
+    campos = _stat(pid)
+    cpu = sum(int(x) for x in campos[11:15]) / tick     # utime stime cutime cstime
+    rss = int(campos[21]) * pagina
+    for hijo in _descendants(pid):
+        try:
+            campos = _stat(hijo)
+        except OSError:
+            continue
+        cpu += sum(int(x) for x in campos[11:13]) / tick    # utime stime
+        rss += int(campos[21]) * pagina
+    return cpu, rss
+
+
+async def run_level(url: str, sesiones: int, duracion: float, pid: int | None) -> dict:
+    latencias, errores, rss_max = [], [], 0
+    cpu0 = _proc_sample(pid)[0] if pid else None
+    t0 = time.monotonic()
+    tareas = [asyncio.create_task(_user(url, t0 + duracion, latencias, errores))
+              for _ in range(sesiones)]
+    while not all(t.done() for t in tareas):
+        await asyncio.sleep(0.5)
+        if pid:
+            rss_max = max(rss_max, _proc_sample(pid)[1])
+    wall = time.monotonic() - t0
+    lat = np.array(latencias) * 1000
+    resultado = {
+        "sessions": sesiones,
+        "duration_s": round(wall, 2),
+        "reruns": len(lat),
+        "errors": len(errores),
+        "throughput_rps": round(len(lat) / wall, 2),
+        "p50_ms": round(float(np.percentile(lat, 50)), 1) if len(lat) else None,
+        "p95_ms": round(float(np.percentile(lat, 95)), 1) if len(lat) else None,
+        "p99_ms": round(float(np.percentile(lat, 99)), 1) if len(lat) else None,
+    }
+    if pid:
+        resultado["cpu_pct"] = round(100 * (_proc_sample(pid)[0] - cpu0) / wall, 1)
+        resultado["rss_mb"] = round(rss_max / 1024 ** 2, 1)
+    if errores:
+        resultado["first_error"] = errores[0]
+    return resultado
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app: str, port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app,
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.enableXsrfProtection", "false",
+         "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(120):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return proc
+        except OSError:
+            time.sleep(0.5)
+    proc.kill()
+    raise RuntimeError("streamlit server did not become healthy")
+
+
+async def main_async(args):
+    proc = None
+    if args.url:
+        # documented as http(s)://host:port; the websocket needs ws(s)://
+        base = args.url.rstrip("/")
+        for http, ws in (("https://", "wss://"), ("http://", "ws://")):
+            if base.startswith(http):
+                base = ws + base[len(http):]
+        url, pid = base + "/_stcore/stream", args.pid
+    else:
+        port = _free_port()
+        proc = start_server(args.app, port)
+        url, pid = f"ws://127.0.0.1:{port}/_stcore/stream", proc.pid
+    salida = open(args.out, "a") if args.out else None
+    try:
+        # one warm-up session so the first level does not pay the cold start
+        await run_level(url, 1, 1, None)
+        for n in args.levels:
+            res = await run_level(url, n, args.duration, pid)
+            res.update(app=args.app, timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"))
+            linea = json.dumps(res)
+            print(linea, flush=True)
+            if salida:
+                salida.write(linea + "\n")
+    finally:
+        if salida:
+            salida.close()
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--url", help="target a running server (http://host:port) instead of starting one")
+    parser.add_argument("--pid", type=int, help="server pid for CPU/RSS when using --url")
+    parser.add_argument("--levels", default="1,5,10,25",
+                        type=lambda s: [int(x) for x in s.split(",")])
+    parser.add_argument("--duration", type=float, default=30, help="seconds per level")
+    parser.add_argument("--out", help="append JSON lines here")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+import pytest
+
+from engine.api import BadRequest, _serve_client, handle
+from engine.refresh import load_dataset
+
+
+class _Store:
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def current(self):
+        return self.dataset
+
+
+@pytest.fixture(scope="module")
+def store():
+    return _Store(load_dataset())
+
+
+def _batch(store, consultas):
+    status, _, payload = handle(store, "POST", "/batch", json.dumps(consultas).encode())
+    assert status == 200
+    return json.loads(payload)["results"]
+
+
+def test_regimen_must_be_a_string(store):
+    with pytest.raises(BadRequest):
+        handle(store, "GET", "/schools?regimen=p%C3%BAb.&regimen=priv.", b"")
+
+
+def test_bad_batch_items_are_isolated(store):
+    res = _batch(store, [{"query": "schools", "params": {"regimen": ["púb."]}},
+                         {"query": "search", "params": ["min_centros", 2]},
+                         {"query": "similar", "params": {"municipio": "ador", "k": 0}},
+                         "search",
+                         {"query": "similar", "params": {"municipio": "ador", "k": 2}}])
+    # our own messages, not Python's exception text
+    assert [r["error"].split(",")[0] for r in res[:4]] == [
+        "unknown regimen", "params must be a JSON object",
+        "k must be a positive integer", "each query must be a JSON object"]
+    assert "error" not in res[4]
+
+
+def _raw(store, request: bytes) -> bytes:
+    async def run():
+        server = await asyncio.start_server(
+            lambda r, w: _serve_client(store, r, w), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            await writer.drain()
+            respuesta = await reader.read()
+            writer.close()
+            return respuesta
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_invalid_content_length(store, length):
+    respuesta = _raw(store, b"POST /batch HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n[]")
+    assert respuesta.startswith(b"HTTP/1.1 400")
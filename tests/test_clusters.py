@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from engine.clusters import build_clusters, minibatch_kmeans
+from engine.similarity import FEATURES, build_index
+
+
+def test_separated_blobs_are_recovered():
+    rng = np.random.default_rng(0)
+    centros = np.array([[0, 0], [10, 0], [0, 10]], dtype=float)
+    x = np.vstack([c + rng.normal(0, 0.5, (200, 2)) for c in centros])
+    encontrados, etiquetas = minibatch_kmeans(x, 3, batch=64)
+    # each blob ends up in one cluster of its own
+    por_blob = [set(etiquetas[i * 200:(i + 1) * 200]) for i in range(3)]
+    assert all(len(s) == 1 for s in por_blob) and len(set.union(*por_blob)) == 3
+    assert np.abs(np.sort(encontrados, axis=0) - np.sort(centros, axis=0)).max() < 0.5
+
+
+def test_clusters_numbered_by_opportunity():
+    df = pd.read_csv("data/indicadores_municipios.csv")
+    modelo = build_clusters(build_index(df), df)
+    perfiles = modelo.perfiles
+    assert perfiles["indice_oportunidad"].is_monotonic_decreasing
+    assert perfiles["n_municipios"].sum() == len(modelo.municipios) == len(df.dropna(subset=FEATURES))
+    asignados = modelo.assignments()
+    assert all(p.startswith(f"{c + 1}:") for p, c in zip(asignados["perfil"], asignados["cluster"]))
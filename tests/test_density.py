@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from engine.density import RESOLUCIONES, build_density, hex_cells, hex_centres, hexbin
+
+
+def test_cell_centre_round_trip():
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(-500, 500, 5000), rng.uniform(-500, 500, 5000)
+    for size in (10.0, 1.0):
+        q, r = hex_cells(x, y, size)
+        cx, cy = hex_centres(q, r, size)
+        # every point lies within its hexagon's circumradius
+        assert (np.hypot(x - cx, y - cy) <= size + 1e-9).all()
+        # and the centre maps back to the same cell
+        q2, r2 = hex_cells(cx, cy, size)
+        assert np.array_equal(q, q2) and np.array_equal(r, r2)
+
+
+def test_hexbin_counts_every_finite_point():
+    lat = np.array([39.47, 39.47, 38.35, np.nan])
+    lon = np.array([-0.38, -0.38, -0.49, -0.4])
+    celdas = hexbin(lat, lon, 5.0)
+    assert celdas["n_centros"].sum() == 3
+    assert len(celdas) == 2
+
+
+def test_density_per_regimen_keeps_every_center():
+    centros = pd.read_csv("data/centroseducativos_filtrados.csv")
+    densidad = build_density(centros)
+    for regimen, grupo in centros.dropna(subset=["regimen"]).groupby("regimen"):
+        con_coordenadas = grupo[["LATITUD", "LONGITUD"]].notna().all(axis=1).sum()
+        assert sorted(densidad[regimen]) == sorted(RESOLUCIONES)
+        for celdas in densidad[regimen].values():
+            assert celdas["n_centros"].sum() == con_coordenadas
+        # coarser cells, fewer of them
+        assert len(densidad[regimen][10.0]) <= len(densidad[regimen][1.0])
@@ -0,0 +1,55 @@
+import os
+import sys
+
+from engine.diskcache import DiskCache
+
+
+class Retirada:
+    """Stands for a class that later code no longer defines."""
+
+
+def _age(cache, key, t):
+    os.utime(cache._path(key), (t, t))
+
+
+def test_lru_eviction(tmp_path):
+    valor = b"x" * 1000
+    cache = DiskCache(str(tmp_path), max_bytes=3500)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.set(key, valor)
+        _age(cache, key, 1_000_000 + i)         # a oldest, c newest
+    assert cache.get("a") == valor              # a hit refreshes "a"
+    cache.set("d", valor)                       # over budget: the least recently used goes
+    assert cache.get("b") is None
+    assert all(cache.get(k) == valor for k in ["a", "c", "d"])
+
+
+def test_get_or_compute_persists(tmp_path):
+    llamadas = []
+    DiskCache(str(tmp_path)).get_or_compute("k", lambda: llamadas.append(1) or "v")
+    assert DiskCache(str(tmp_path)).get_or_compute("k", lambda: llamadas.append(1) or "w") == "v"
+    assert len(llamadas) == 1
+
+
+def test_stale_pickle_is_a_miss(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    modulo, clase = sys.modules[__name__], Retirada
+    cache.set("viejo", clase())
+    del modulo.Retirada
+    try:
+        assert cache.get("viejo", "miss") == "miss"
+    finally:
+        modulo.Retirada = clase
+    assert not os.path.exists(cache._path("viejo"))
+
+
+def test_schema_version_keys_derived_data_not_the_version(tmp_path, monkeypatch):
+    from engine import refresh
+
+    cache = DiskCache(str(tmp_path))
+    antes = refresh.load_dataset(cache=cache).version
+    assert len(os.listdir(tmp_path)) == 1
+    monkeypatch.setattr(refresh, "SCHEMA_VERSION", refresh.SCHEMA_VERSION + 1)
+    # same data, same version; the derived structures are rebuilt under a new key
+    assert refresh.load_dataset(cache=cache).version == antes
+    assert len(os.listdir(tmp_path)) == 2
@@ -0,0 +1,61 @@
+import random
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from engine.etl import count_range, plan_tasks, run, write_table
+from engine.text import fold
+
+
+@pytest.fixture
+def dump(tmp_path):
+    """Raw CSV with uneven line lengths; returns its path and the true counts."""
+    rnd = random.Random(0)
+    nombres = ["Ador", "Ademuz", "València", "l'Alfàs del Pi", "Alcoi/Alcoy"]
+    filas = [(rnd.choice(nombres), "x" * rnd.randrange(0, 40)) for _ in range(500)]
+    path = tmp_path / "viviendas.csv"
+    path.write_text("id;municipio;descripcion\n"
+                    + "".join(f"{i};{m};{d}\n" for i, (m, d) in enumerate(filas)), encoding="utf-8")
+    return str(path), Counter(fold(m) for m, _ in filas)
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 64, 333, 4096, 10 ** 6])
+def test_ranges_own_each_record_once(dump, chunk):
+    path, esperado = dump
+    total = Counter()
+    for tarea in plan_tasks(path, chunk):
+        total.update(count_range(*tarea))
+    assert total == esperado
+
+
+def test_boundary_on_line_start(dump):
+    path, esperado = dump
+    with open(path, "rb") as f:
+        datos = f.read()
+    # cut exactly at the start of the 10th line: that line belongs to the second range
+    corte = [i for i, b in enumerate(datos) if b == ord("\n")][9] + 1
+    _, _, _, sep, columna, header = plan_tasks(path)[0]
+    total = (count_range(path, 0, corte, sep, columna, header)
+             + count_range(path, corte, len(datos), sep, columna, header))
+    assert total == esperado
+
+
+def test_write_table_reproduces_shipped_csv(tmp_path):
+    # integer-valued ratios must come out as "0", not "0.0", and NA unquoted
+    origen = "data/indicadores_municipios.csv"
+    write_table(pd.read_csv(origen), str(tmp_path / "out.csv"))
+    with open(origen, "rb") as a, open(tmp_path / "out.csv", "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_missing_counts_stay_na(tmp_path):
+    indicadores = pd.read_csv("data/indicadores_municipios.csv").head(3)
+    (tmp_path / "viviendas").mkdir()
+    (tmp_path / "viviendas" / "a.csv").write_text(
+        "municipio\n" + f"{indicadores.municipio[0]}\n" * 5, encoding="utf-8")
+    out = run(indicadores, str(tmp_path), processes=1)
+    assert out["total_ofertas"].tolist()[0] == 5
+    assert out["total_ofertas"].iloc[1:].isna().all()
+    assert out["viviendas_por_1000hab"].iloc[1:].isna().all()
+    assert out["empresas_total"].equals(indicadores["empresas_total"])
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from engine.fulltext import TextIndex, tokenize
+
+
+@pytest.fixture(scope="module")
+def centros():
+    return pd.DataFrame({
+        "DENOMINACION": ["CEIP LA RAMBLA", "IES LA RAMBLA", "CEIP LLUIS VIVES", "IES SERRA MARIOLA"],
+        "tipo": ["col·legi d'educació infantil i primària", "institut d'educació secundària",
+                 "col·legi d'educació infantil i primària", "institut d'educació secundària"],
+        "regimen": ["púb.", "púb.", "priv.", "púb."],
+        "localidad": ["AGOST", "AGOST", "VALÈNCIA", "BOCAIRENT"],
+        "LATITUD": [38.44, 38.44, 39.47, 38.77],
+        "LONGITUD": [-0.64, -0.64, -0.38, -0.61]})
+
+
+def test_tokenize_folds_and_translates():
+    assert tokenize("Col·legio de Educación") == ["collegio", "educacio"]
+    assert tokenize("Colegio Público") == ["collegi", "public"]
+
+
+def test_all_terms_first_then_prefix(centros):
+    indice = TextIndex(centros)
+    pos, _ = indice.search("instituto rambla")
+    assert pos.tolist()[0] == 1                     # the only center with both terms
+    pos, _ = indice.search("rambl")                 # still typing: prefix match
+    assert sorted(pos.tolist()) == [0, 1]
+    pos, _ = indice.search("colegio valencia")
+    assert pos.tolist() == [2]
+
+
+def test_filters_are_masks(centros):
+    indice = TextIndex(centros)
+    pos, _ = indice.search("ceip", regimenes=["priv."])
+    assert pos.tolist() == [2]
+    pos, _ = indice.search("ies", cerca=(38.44, -0.64, 10.0))
+    assert pos.tolist() == [1]
+    assert indice.search("de la")[0].size == 0      # only stopwords
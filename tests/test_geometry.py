@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from engine.geometry import TOLERANCIAS, build_levels, join_indicators, simplify_shared
+
+
+def _shared_border():
+    """Wiggly border x ~ 1 from (1, 0) to (1, 1), densely sampled."""
+    y = np.linspace(0, 1, 201)
+    x = 1 + 0.02 * np.sin(y * 9) * np.sin(y * np.pi)
+    return np.column_stack([x, y])
+
+
+def _rings():
+    borde = _shared_border()
+    izquierda = np.vstack([[[0, 0]], borde, [[0, 1]], [[0, 0]]])             # border walked upwards
+    derecha = np.vstack([[[2, 0]], [[2, 1]], borde[::-1], [[2, 0]]])          # and downwards
+    return izquierda, derecha
+
+
+def _on_border(ring):
+    pts = {tuple(p) for p in np.round(ring, 7)}
+    return {p for p in pts if 0.9 < p[0] < 1.1}
+
+
+def test_shared_border_stays_identical():
+    izquierda, derecha = _rings()
+    for tol in (0.0002, 0.003, 0.01):
+        a, b = simplify_shared([izquierda, derecha], tol)
+        assert len(_on_border(a)) < len(_shared_border())
+        assert _on_border(a) == _on_border(b)
+
+
+def test_rings_stay_closed():
+    for ring in simplify_shared(list(_rings()), 0.01):
+        assert len(ring) >= 4
+        assert np.array_equal(ring[0], ring[-1])
+
+
+def test_levels_join_by_folded_name():
+    cuadrado = [[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]
+    geojson = {"type": "FeatureCollection", "features": [
+        {"properties": {"nombre": "València"},
+         "geometry": {"type": "MultiPolygon", "coordinates": [
+             [cuadrado], [[[x + 2, y] for x, y in cuadrado]]]}},
+        {"properties": {"NAME": "Ador"}, "geometry": {"type": "Polygon", "coordinates": [cuadrado]}},
+        {"properties": {}, "geometry": {"type": "Polygon", "coordinates": [cuadrado]}}]}
+    niveles = build_levels(json.dumps(geojson).encode())
+    assert sorted(niveles) == sorted(TOLERANCIAS)
+    # one row per polygon, unnamed features dropped
+    assert niveles[5]["key"].tolist() == ["valencia", "valencia", "ador"]
+    df = pd.DataFrame({"municipio": ["valència", "ador", "agost"], "indice_oportunidad": [1, 2, 3]})
+    unidas = join_indicators(niveles[5], df)
+    assert unidas.groupby("municipio").size().to_dict() == {"ador": 1, "valència": 2}
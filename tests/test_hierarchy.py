@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from engine.hierarchy import rollup
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "municipio": ["a", "b", "c"],
+        "Poblacion_Total": [1000.0, 3000.0, None],
+        "n_centros_total": [1.0, 5.0, 2.0],
+        "total_ofertas": [10.0, 0.0, 1.0],
+        "empresas_total": [100.0, 200.0, 3.0],
+        "lat": [39.0, 40.0, 38.0], "lon": [-1.0, 0.0, 0.0]})
+
+
+def test_ratios_are_recomputed_from_sums(df):
+    jerarquia = pd.DataFrame({"municipio": ["a", "b", "c"], "comarca": ["x", "x", "y"],
+                              "provincia": ["v", "v", "v"]})
+    niveles = rollup(df, jerarquia)
+    assert set(niveles) == {"municipio", "comarca", "provincia"}
+    # "c" has no population: it cannot be weighted, so "y" has no row
+    x = niveles["comarca"].set_index("comarca").loc["x"]
+    assert niveles["comarca"]["comarca"].tolist() == ["x"]
+    assert x["n_municipios"] == 2
+    assert x["centros_por_1000hab"] == pytest.approx(6 / 4000 * 1000)     # not the mean of 1 and 1.67
+    assert x["lat"] == pytest.approx((39 * 1000 + 40 * 3000) / 4000)
+
+
+def test_without_mapping_only_municipalities(df):
+    assert list(rollup(df, None)) == ["municipio"]
+    sin_provincia = pd.DataFrame({"municipio": ["a"], "comarca": ["x"], "provincia": [None]})
+    assert list(rollup(df, sin_provincia)) == ["municipio", "comarca"]
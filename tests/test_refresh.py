@@ -0,0 +1,41 @@
+import os
+import shutil
+
+import pytest
+
+from engine.refresh import DatasetStore
+
+
+@pytest.fixture
+def fuentes(tmp_path):
+    for nombre in ("indicadores_municipios.csv", "centroseducativos_filtrados.csv"):
+        shutil.copy(os.path.join("data", nombre), tmp_path / nombre)
+    return tmp_path
+
+
+def _store(d):
+    return DatasetStore(str(d / "indicadores_municipios.csv"), str(d / "centroseducativos_filtrados.csv"),
+                        str(d / "accesibilidad.csv"), str(d / "jerarquia.csv"), str(d / "limites.geojson"))
+
+
+def test_refresh_swaps_only_on_new_content(fuentes):
+    store = _store(fuentes)
+    antes = store.current()
+    csv = fuentes / "indicadores_municipios.csv"
+
+    os.utime(csv, (1, 1))                                   # touched, same bytes
+    assert not store.refresh() and store.current() is antes
+
+    csv.write_text(csv.read_text(encoding="utf-8").replace('"ador",1742', '"ador",1743'), encoding="utf-8")
+    assert store.refresh()
+    nuevo = store.current()
+    assert nuevo.version != antes.version
+    assert nuevo.df.set_index("municipio").loc["ador", "Poblacion_Total"] == 1743
+
+
+def test_broken_source_keeps_serving(fuentes):
+    store = _store(fuentes)
+    antes = store.current()
+    os.remove(fuentes / "centroseducativos_filtrados.csv")
+    assert not store.refresh()
+    assert store.current() is antes
@@ -0,0 +1,31 @@
+import os
+
+from engine.report import BUNDLE, prune_reports, report_dir, submit_report
+
+
+def _bundle(root, nombre, t, size=1000):
+    path = root / nombre
+    path.mkdir()
+    (path / BUNDLE).write_bytes(b"x" * size)
+    os.utime(path / BUNDLE, (t, t))
+    return path
+
+
+def test_prune_keeps_most_recently_used(tmp_path):
+    for i, nombre in enumerate(["a", "b", "c", "d"]):
+        _bundle(tmp_path, nombre, 1_000_000 + i)
+    os.mkdir(tmp_path / "tmpxyz")                   # a render in progress
+    prune_reports(str(tmp_path), max_bytes=2500)
+    assert sorted(os.listdir(tmp_path)) == ["c", "d", "tmpxyz"]
+
+
+def test_hit_refreshes_lru_position(tmp_path):
+    import pandas as pd
+
+    comparacion = {"indicadores": pd.DataFrame({"municipio": ["ador"]})}
+    out = report_dir("v1", ["ador"], root=str(tmp_path))
+    _bundle(tmp_path, os.path.basename(out), 1_000_000)
+    _bundle(tmp_path, "reciente", 2_000_000)
+    assert submit_report("v1", comparacion, root=str(tmp_path)).result() == os.path.join(out, BUNDLE)
+    prune_reports(str(tmp_path), max_bytes=1500)
+    assert os.listdir(tmp_path) == [os.path.basename(out)]
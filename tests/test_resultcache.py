@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+from engine.resultcache import ResultCache
+
+
+def _concurrently(n, fn):
+    resultados, errores = [None] * n, [None] * n
+
+    def worker(i):
+        try:
+            resultados[i] = fn()
+        except Exception as e:
+            errores[i] = e
+    hilos = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join(10)
+    return resultados, errores
+
+
+def test_single_flight():
+    cache = ResultCache()
+    llamadas = []
+
+    def compute():
+        llamadas.append(1)
+        time.sleep(0.2)         # keep the key in flight while the others arrive
+        return object()
+
+    resultados, errores = _concurrently(8, lambda: cache.get_or_compute(("v", "k"), compute))
+    assert len(llamadas) == 1
+    assert errores == [None] * 8
+    assert all(r is resultados[0] for r in resultados)
+
+
+def test_exception_reaches_waiters_and_is_not_cached():
+    cache = ResultCache()
+    llamadas = []
+
+    def falla():
+        llamadas.append(1)
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    _, errores = _concurrently(4, lambda: cache.get_or_compute(("v", "k"), falla))
+    assert len(llamadas) == 1
+    assert all(isinstance(e, ValueError) for e in errores)
+    # the failure is not remembered: the next call computes again
+    assert cache.get_or_compute(("v", "k"), lambda: 42) == 42
+    assert len(cache) == 1
+
+
+def test_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", pytest.fail)          # hit: "a" becomes most recent
+    cache.get_or_compute("c", lambda: 3)            # evicts "b"
+    assert cache.get_or_compute("a", pytest.fail) == 1
+    assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+
+
+def test_compare_keyed_by_version_and_selection():
+    from dataclasses import replace
+
+    from engine.refresh import load_dataset
+    from engine.resultcache import cached_compare
+
+    dataset = load_dataset()
+    a = cached_compare(dataset, ["ador", "ademuz"])
+    assert cached_compare(dataset, ["ademuz", "ador"]) is a        # order does not matter
+    otra = replace(dataset, version="otra")
+    assert cached_compare(otra, ["ador", "ademuz"]) is not a       # a new version never reuses it
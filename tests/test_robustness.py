@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine import robustness
+from engine.robustness import CUANTILES, RATIOS, rank_stability, sample_weights
+
+
+@pytest.mark.parametrize("bloque_bytes", [1, 10 ** 9])
+def test_histogram_matches_full_ranks(monkeypatch, bloque_bytes):
+    monkeypatch.setattr(robustness, "BLOQUE_BYTES", bloque_bytes)
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(rng.random((40, 3)) * [5, 20, 500], columns=RATIOS)
+    df["municipio"] = [f"m{i}" for i in range(len(df))]
+    res = rank_stability(df, n=301).resumen
+
+    # reference: every rank of every sample kept in memory
+    puntos = df[RATIOS].to_numpy() @ sample_weights(301).T
+    rangos = np.argsort(np.argsort(-puntos.astype(np.float32), axis=0), axis=0) + 1
+    q = np.quantile(rangos, CUANTILES, axis=1)
+    np.testing.assert_allclose(res[["rango_p5", "rango_mediana", "rango_p95"]].to_numpy().T, q)
+    np.testing.assert_allclose(res["p_top1"], (rangos == 1).mean(axis=1))
+    np.testing.assert_allclose(res["p_top10"], (rangos <= 10).mean(axis=1))
@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+from engine.search import FuzzyIndex, word_distance
+
+
+@pytest.fixture(scope="module")
+def indice():
+    return FuzzyIndex(pd.read_csv("data/indicadores_municipios.csv")["municipio"].unique())
+
+
+@pytest.mark.parametrize("consulta, esperado", [
+    ("ador", "ador"), ("ADÓR", "ador"), ("adr", "ador"),
+    ("alicante", "alacant/alicante"), ("alacant", "alacant/alicante"),
+    ("alcoy", "alcoi/alcoy")])
+def test_finds_with_typos_and_either_language(indice, consulta, esperado):
+    assert indice.names(consulta, 3)[0] == esperado
+
+
+def test_no_match_is_empty(indice):
+    assert indice.names("zzzzzz") == [] and indice.names("  ") == []
+
+
+def test_word_distance_starts_at_any_word():
+    assert word_distance("pi", "l alfas del pi") == 0
+    assert word_distance("lfas", "l alfas del pi") == 1        # not free inside a word
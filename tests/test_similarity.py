@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from engine.similarity import FEATURES, build_index
+
+
+def test_query_matches_brute_force():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((60, len(FEATURES))) * 100, columns=FEATURES)
+    df["municipio"] = [f"m{i}" for i in range(len(df))]
+    indice = build_index(df)
+    w = np.array([2.0, 1.0, 0.5, 1.0, 0.0])
+    res = indice.query("m7", k=4, weights=w)
+
+    d = np.sqrt((((indice.z - indice.z[7]) ** 2) * w).sum(axis=1))
+    d[7] = np.inf
+    esperado = np.argsort(d)[:4]
+    assert res["municipio"].tolist() == [f"m{i}" for i in esperado]
+    np.testing.assert_allclose(res["distancia"], d[esperado])
+
+
+def test_unknown_or_empty_queries():
+    df = pd.DataFrame(np.ones((3, len(FEATURES))), columns=FEATURES)
+    df["municipio"] = ["a", "b", "c"]
+    indice = build_index(df)                    # constant features: no division by zero
+    assert indice.query("zz").empty and indice.query("a", k=0).empty
+    assert len(indice.query("a", k=10)) == 2
@@ -0,0 +1,39 @@
+import os
+from dataclasses import dataclass
+
+import pandas as pd
+
+from engine.snapshots import SnapshotManager
+
+
+@dataclass(frozen=True)
+class _Dataset:
+    version: str
+    df: pd.DataFrame
+    centros_df: pd.DataFrame
+
+
+def _dataset(version):
+    return _Dataset(version, pd.DataFrame({"municipio": ["ador"], "lat": [38.9]}),
+                    pd.DataFrame({"n": [1, 2]}))
+
+
+def test_roundtrip_is_memory_mapped(tmp_path):
+    mapped = SnapshotManager(str(tmp_path)).register(_dataset("v1"), schema=3)
+    assert os.listdir(tmp_path) == ["v1.s3"]
+    assert mapped.df["lat"].tolist() == [38.9]
+    assert mapped.df["municipio"].tolist() == ["ador"]
+
+
+def test_prunes_directories_from_earlier_runs(tmp_path):
+    for i, version in enumerate(["a", "b", "c", "d"]):
+        SnapshotManager(str(tmp_path), keep=10).register(_dataset(version))
+        os.utime(tmp_path / f"{version}.s0", (1_000_000 + i, 1_000_000 + i))
+    os.mkdir(tmp_path / "e.s0.tmp123")              # a publish in progress
+    SnapshotManager(str(tmp_path), keep=2)
+    assert sorted(os.listdir(tmp_path)) == ["c.s0", "d.s0", "e.s0.tmp123"]
+
+    # a new process registering an old version makes it the newest again
+    SnapshotManager(str(tmp_path), keep=2).register(_dataset("c"))
+    SnapshotManager(str(tmp_path), keep=2).register(_dataset("f"))
+    assert sorted(os.listdir(tmp_path)) == ["c.s0", "e.s0.tmp123", "f.s0"]
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from engine.stats import build_catalog, column_stats, quantile_position
+
+
+def test_repeated_quantiles():
+    # most values are 0: the lower deciles all collapse onto the same quantile
+    valores = pd.Series([0.0] * 70 + list(np.linspace(1, 30, 30)))
+    stats = column_stats(valores)
+    assert len(set(stats.quantiles)) < len(stats.quantiles)
+    t = quantile_position(np.sort(valores.to_numpy()), stats)
+    assert np.isfinite(t).all()
+    assert ((t >= 0) & (t <= 1)).all()
+    assert (np.diff(t) >= 0).all()
+    assert t[-1] == 1.0
+
+
+def test_constant_column():
+    stats = column_stats(pd.Series([5.0] * 10))
+    assert (quantile_position([5.0, 5.0], stats) == 0).all()
+
+
+def test_catalog_matches_the_frames():
+    df = pd.DataFrame({"lat": [39.0, 39.5, None], "lon": [-0.4, -0.3, -0.2],
+                       "indice_oportunidad": [10.0, 30.0, 20.0]})
+    centros = pd.DataFrame({"regimen": ["púb.", "púb.", "priv.", None],
+                            "localidad": ["ador", "ador", "agost", "agost"],
+                            "DENOMINACION": ["a", "b", "c", "d"],
+                            "LATITUD": [38.9, 39.1, 38.4, 38.0],
+                            "LONGITUD": [-0.2, -0.3, -0.6, -0.1]})
+    catalog = build_catalog(df, centros)
+    # rows without coordinates are not on the map, so not in its stats
+    assert catalog.maximos["indice_oportunidad"] == 30.0
+    assert catalog.indicadores["indice_oportunidad"].count == 2
+    assert sorted(catalog.regimenes) == ["priv.", "púb."]
+    publicos = catalog.regimenes["púb."]
+    assert publicos.n_centros == 2 and publicos.centros_por_localidad.max == 2
+    assert (publicos.bbox.lat_min, publicos.bbox.lat_max) == (38.9, 39.1)
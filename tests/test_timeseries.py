@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from engine.timeseries import CONTEOS, RATIOS, SeriesStore, ensure_store
+
+
+def _extract(municipios, base):
+    n = len(municipios)
+    datos = {"municipio": municipios}
+    for i, col in enumerate(CONTEOS + RATIOS):
+        datos[col] = np.arange(n) * 7.0 + base * (i + 1) + (0.123 if col in RATIOS else 0)
+    return pd.DataFrame(datos)
+
+
+def test_delta_encoding_round_trip(tmp_path):
+    store = SeriesStore.empty()
+    store.append("2024-01", _extract(["a", "b"], 100))
+    febrero = _extract(["a", "b"], 90)
+    febrero.loc[1, "total_ofertas"] = np.nan            # a gap in the middle of the series
+    store.append("2024-02", febrero)
+    store.append("2024-03", _extract(["a", "b", "c"], 95))  # "c" appears later
+    store.save(str(tmp_path / "s.npz"))
+
+    leido = SeriesStore.load(str(tmp_path / "s.npz"))
+    assert leido.periodos == store.periodos
+    assert leido.municipios.tolist() == ["a", "b", "c"]
+    for col in CONTEOS:
+        # counts are exact, NaN included, after the cumsum
+        np.testing.assert_array_equal(leido.valores[col], store.valores[col])
+    assert np.isnan(leido.valores["total_ofertas"][1, 1])
+    assert np.isnan(leido.valores["Poblacion_Total"][2, :2]).all()
+    for col in RATIOS:
+        np.testing.assert_allclose(leido.valores[col], store.valores[col], rtol=1e-6)
+
+
+def test_ensure_store_appends_and_rebuilds(tmp_path):
+    series, path = tmp_path / "series", str(tmp_path / "s.npz")
+    series.mkdir()
+    for mes, base in [("01", 100), ("02", 90)]:
+        _extract(["a", "b"], base).to_csv(series / f"indicadores_2024-{mes}.csv", index=False)
+    assert ensure_store(str(series), path).periodos == ["2024-01", "2024-02"]
+
+    _extract(["a", "b"], 80).to_csv(series / "indicadores_2024-03.csv", index=False)
+    store = ensure_store(str(series), path)
+    assert store.periodos == ["2024-01", "2024-02", "2024-03"]
+
+    # a rewritten past month is picked up, not kept from the old store
+    _extract(["a", "b"], 10).to_csv(series / "indicadores_2024-01.csv", index=False)
+    assert ensure_store(str(series), path).slice("Poblacion_Total")["2024-01"].tolist() == [10, 17]
+
+    # a month older than the last one stored is inserted in order
+    _extract(["a", "b"], 5).to_csv(series / "indicadores_2023-12.csv", index=False)
+    assert ensure_store(str(series), path).periodos[0] == "2023-12"
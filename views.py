@@ -0,0 +1,556 @@
+"""Streamlit views over the shared engine.
+
+``render()`` draws the whole app; ``app.py`` and ``app_prueba1.py`` are thin
+entry points that only choose the options (e.g. the indicator map basemap).
+Data, indexes, colours, layers and figures come from ``engine``; this module
+only lays out widgets and keeps per-process ``st.cache_data`` entries keyed by
+the dataset version.
+"""
+import streamlit as st
+import pandas as pd
+import plotly.io as pio
+import numpy as np
+
+from engine import runtime
+from engine.assets import picture_html
+from engine.clusters import PALETA as CLUSTER_PALETA
+from engine.decks import (TRITONE_SCALE, density_layer, detail_layer, general_layer, highlight_layer,
+                          indicator_deck, indicator_layer, linear_fill, map_rows, regimen_rows,
+                          school_markers, schools_deck, schools_view)
+from engine.density import RESOLUCIONES as DENSITY_RESOLUCIONES
+from engine.figures import (absolute_table, fig_colorbar, fig_comparison, fig_evolution, fig_individual,
+                            fig_opportunity, fig_pie, fig_radar, fig_rank_interval, fig_scatter)
+from engine.geometry import join_indicators
+from engine.queries import max_dist_bound
+from engine.report import submit_report
+from engine.resultcache import cached_compare, cached_rank_stability, cached_schools, cached_search
+from engine.robustness import CONCENTRACION as ROBUSTNESS_CONCENTRACION
+from engine.similarity import FEATURES as SIMILARITY_FEATURES
+from engine.snapshots import cache_key
+from engine.stats import QUANTILE_LEVELS
+from engine.timeseries import COLUMNAS as SERIES_COLUMNAS
+
+RATIOS = ["centros_por_1000hab", "viviendas_por_1000hab", "empresas_por_1000hab"]
+
+
+#  1. CACHED DERIVATIONS
+# Keyed by the dataset version (content hash): invalidated exactly when the
+# data changes. Underscored args are not hashed.
+@st.cache_data(max_entries=64)
+def map_data(version, nivel, indicador, escala, _df, _stats):
+    return runtime.disk_cache().get_or_compute(
+        cache_key(version, "map_rows", nivel, indicador, escala),
+        lambda: map_rows(_df, indicador, escala, _stats))
+
+@st.cache_data(max_entries=16)
+def cluster_map_data(version, indicador, escala, _df_mapa, _clusters):
+    """Map rows with their profile cluster and its categorical colour."""
+    return _df_mapa.merge(_clusters.assignments(), on="municipio")
+
+@st.cache_data(max_entries=16)
+def map_polygons(version, zoom, indicador, escala, perfiles, _geometrias, _df_mapa):
+    """Simplified boundaries for one zoom level joined to the map rows."""
+    return join_indicators(_geometrias, _df_mapa)
+
+@st.cache_data(max_entries=64)
+def series_frame(version, firma, indicador, periodo, _series, _df):
+    """Map rows for one period of the time series (colours precomputed)."""
+    i = _series.periodos.index(periodo)
+    frame = pd.DataFrame({
+        "municipio": _series.municipios,
+        indicador: _series.valores[indicador][:, i],
+        "fill_color": _series.frames(indicador)[i].tolist()})
+    return frame.merge(_df[["municipio", "lat", "lon"]], on="municipio").dropna(subset=[indicador])
+
+@st.cache_data(max_entries=64)
+def markers_for(version, regimen, _marcadores, _stats):
+    return school_markers(_marcadores, _stats)
+
+@st.cache_data(max_entries=64)
+def centros_filtrados(version, regimen, _centros_df):
+    return regimen_rows(_centros_df, regimen)
+
+@st.cache_data(max_entries=64)
+def legend_json(version, nivel, indicador, escala, firma, cmin, cmax, _stats):
+    """Colour bar under the indicator map, kept as JSON in the disk tier."""
+    def compute():
+        if escala == "Quantile":
+            # same colours, but the axis is the CDF: label ticks with the deciles
+            fig = fig_colorbar("RdYlGn", 0, 1, indicador, QUANTILE_LEVELS,
+                               [f"{q:.3g}" for q in _stats.quantiles])
+        else:
+            fig = fig_colorbar("RdYlGn", cmin, cmax, indicador)
+        return fig.to_json()
+    return runtime.disk_cache().get_or_compute(
+        cache_key(version, "legend", nivel, indicador, escala, firma), compute)
+
+# Exported reports render in a worker pool; while one is pending this fragment
+# polls it without rerunning the whole page
+@st.fragment(run_every=1.0)
+def report_progress(futuro):
+    if futuro.done():
+        st.rerun()
+    st.info("⏳ Rendering report…")
+
+
+#  2. HOME
+def home():
+    with st.container():
+        # responsive WebP/AVIF variants when built, the original PNG otherwise
+        hero = picture_html("collage", alt="Municipalities of the Valencian Community")
+        if hero:
+            st.markdown(hero, unsafe_allow_html=True)
+        else:
+            st.image("collage.png", use_container_width=True)
+
+        st.markdown("""
+        <p style='text-align:center;font-size:18px;'>
+        This interactive tool helps you compare municipalities based on three key factors:<br><br>
+        <b><i class="fa-solid fa-graduation-cap"></i> Education</b> ·
+        <b><i class="fa-solid fa-house-chimney"></i> Housing</b> ·
+        <b><i class="fa-solid fa-briefcase"></i> Employment</b><br><br>
+        </p> """, unsafe_allow_html=True)
+
+        st.markdown("### What can you do with this app?")
+        st.markdown(f"""
+        <div class='callout'>
+          <ul style="list-style-type:none;margin:0;">
+            <li><i class="fa-solid fa-chart-pie"></i> <b>Municipality Comparator</b><br>
+                Compare up to 3 municipalities using interactive visualizations like radar, bar & pie charts.
+            </li><br>
+            <li><i class="fa-solid fa-map-location-dot"></i> <b>Municipality Map</b><br>
+                Display education, housing or business activity on a map.
+            </li><br>
+            <li><i class="fa-solid fa-school"></i> <b>Educational Centers Map</b><br>
+                Explore the geographic distribution of schools by municipality or by individual center.
+            </li><br>
+            <li><i class="fa-solid fa-magnifying-glass"></i> <b>Custom Search</b><br>
+                Find municipalities that meet your minimum requirements.
+            </li>
+          </ul>
+        </div> """, unsafe_allow_html=True)
+
+        st.markdown("""
+        <div class='box'>
+        <i class="fa-solid fa-circle-info"></i> <i>Data based on public sources and local statistics.</i><br>
+        <i class="fa-solid fa-code"></i> <i>Developed by Andrea Almela, Anna Aparici and Sergi Martínez</i>
+        </div> """, unsafe_allow_html=True)
+
+
+#  3. COMPARATOR
+def comparator(dataset, series):
+    version = dataset.version
+    with st.container():
+        st.header("MUNICIPALITY COMPARATOR")
+        st.markdown("### <i class='fa-solid fa-receipt'></i> What can you do here?",
+            unsafe_allow_html=True)
+
+        st.markdown("""
+        Compare different municipalities in the Valencian Community by access to:
+
+        - 🏫 **Educational centers**  
+        - 🏘️ **Available housing**  
+        - 💼 **Registered companies**
+
+        All indicators are **normalized per 1000 inhabitants**.  
+        The **opportunity index** combines them (40 % education, 30 % housing, 30 % employment).""")
+
+        # compare comarcas or provinces too when the roll-up exists; the
+        # aggregated tables reuse the "municipio" column so the charts below stay the same
+        nivel = "municipio"
+        if len(dataset.niveles) > 1:
+            nivel = st.radio("Compare at level:", list(dataset.niveles), horizontal=True, key="nivel_comparador")
+        df_comp = dataset.df if nivel == "municipio" else dataset.niveles[nivel].rename(columns={nivel: "municipio"})
+        clave = "seleccionados" if nivel == "municipio" else f"seleccionados_{nivel}"
+
+        municipios = df_comp["municipio"].unique()
+        if clave not in st.session_state:
+            st.session_state[clave] = list(municipios[:2])
+
+        # "municipalities like this one": prebuilt nearest-neighbour index
+        if nivel == "municipio":
+            with st.expander("🔍 Find municipalities similar to one you know"):
+                referencia = st.selectbox("Reference municipality:", dataset.vecinos.municipios)
+                st.caption("Weight of each indicator in the similarity:")
+                pesos = [col.slider(f.replace("_", " "), 0.0, 3.0, 1.0, key=f"peso_{f}")
+                         for col, f in zip(st.columns(len(SIMILARITY_FEATURES)), SIMILARITY_FEATURES)]
+                similares = dataset.vecinos.query(referencia, 5, pesos)
+                st.dataframe(similares, hide_index=True)
+
+                def comparar_similares():
+                    st.session_state["seleccionados"] = [referencia] + similares["municipio"].head(2).tolist()
+                st.button("Compare with the 2 most similar", on_click=comparar_similares)
+
+        # typo/accent-tolerant lookup; the widget itself only filters by prefix
+        if nivel == "municipio":
+            consulta = st.text_input("🔎 Search a municipality (Valencian or Spanish name):",
+                                     key="buscar_municipio")
+            encontrados = dataset.buscador.names(consulta, 6) if consulta else []
+            if consulta and not encontrados:
+                st.caption("No municipality matches that name.")
+
+            def anadir(nombre):
+                if nombre not in st.session_state[clave]:
+                    st.session_state[clave] = st.session_state[clave] + [nombre]
+            for col, nombre in zip(st.columns(6), encontrados):
+                col.button(f"➕ {nombre}", key=f"anadir_{nombre}", on_click=anadir, args=(nombre,))
+
+        seleccionados = st.multiselect(
+            "Select up to 3 municipalities to compare:" if nivel == "municipio"
+            else f"Select up to 3 ({nivel}) to compare:",
+            municipios, key=clave)
+
+        if len(seleccionados) == 0:
+            st.info("Please select at least one municipality to compare.")
+            return
+        if len(seleccionados) > 3:
+            st.warning("You can only select up to 3 municipalities.")
+            return
+
+        # shared across sessions; identical concurrent requests compute once
+        comparacion = cached_compare(dataset, seleccionados, nivel)
+        df_sel = comparacion["indicadores"]
+
+        st.markdown(
+            "#### <i class='fa-solid fa-clipboard-list'></i> Indicators per municipality",
+            unsafe_allow_html=True)
+        st.dataframe(df_sel.set_index("municipio"))
+
+        # warning for very small municipalities
+        pequeños = comparacion["pequenos"]
+        if pequeños:
+            st.warning(
+                "⚠ The following municipalities have fewer than 1000 inhabitants, "
+                f"so ratios may be distorted: {', '.join(pequeños)}")
+
+        # absolute-value table
+        st.markdown("#### <i class='fa-solid fa-receipt'></i> Absolute values", unsafe_allow_html=True)
+
+        st.dataframe(absolute_table(df_sel))
+
+        # bar comparison
+        st.markdown("#### <i class='fa-solid fa-chart-column'></i> Indicator comparison", unsafe_allow_html=True)
+
+        ver_reales = st.checkbox("🔁 Show real values (not normalized)", value=False)
+
+        df_graf = df_sel.set_index("municipio")[RATIOS]
+        df_norm = comparacion["normalizado"].loc[df_graf.index]
+        if not ver_reales:
+            df_graf = df_norm
+
+        st.plotly_chart(fig_comparison(df_graf, not ver_reales), use_container_width=True)
+
+        # individual indicators
+        st.markdown("#### <i class='fa-solid fa-chart-column'></i> Individual indicators", unsafe_allow_html=True)
+        for ind in RATIOS:
+            st.plotly_chart(fig_individual(df_sel, ind), use_container_width=True)
+
+        # radar
+        st.markdown("#### <i class='fa-solid fa-chart-column'></i> Relative profile (Radar)", unsafe_allow_html=True)
+        # df_norm: same normalization as the bar chart, computed once above
+        st.plotly_chart(fig_radar(df_norm), use_container_width=True)
+
+        # pie charts
+        st.markdown("#### <i class='fa-solid fa-chart-pie'></i> Normalized distribution of indicators", unsafe_allow_html=True)
+
+        for municipio, vals in comparacion["normalizado_global"].iterrows():
+            st.plotly_chart(fig_pie(municipio, vals), use_container_width=True)
+
+        # opportunity index + scatter + summary
+        st.markdown("#### <i class='fa-solid fa-star'></i> Opportunity index", unsafe_allow_html=True)
+
+        st.plotly_chart(fig_opportunity(df_sel), use_container_width=True)
+
+        st.markdown("#### <i class='fa-solid fa-chart-column'></i> Housing vs companies relationship", unsafe_allow_html=True)
+        st.plotly_chart(fig_scatter(df_sel), use_container_width=True)
+
+        if series is not None and nivel == "municipio":
+            st.markdown("#### <i class='fa-solid fa-chart-line'></i> Evolution over time", unsafe_allow_html=True)
+            ind_serie = st.selectbox("Indicator:", SERIES_COLUMNAS, index=SERIES_COLUMNAS.index("total_ofertas"))
+            st.plotly_chart(fig_evolution(series.long(ind_serie, seleccionados), ind_serie),
+                            use_container_width=True)
+
+        st.subheader("📌 Summary of results")
+        mejor   = comparacion["mejor"]["indice_oportunidad"]
+        centros = comparacion["mejor"]["centros_por_1000hab"]
+        viv     = comparacion["mejor"]["viviendas_por_1000hab"]
+        emp     = comparacion["mejor"]["empresas_por_1000hab"]
+
+        col1, col2 = st.columns(2, gap="large")
+        col1.success(f"🥇 Highest opportunity index: **{mejor}**")
+        col1.info   (f"🏫 Most schools /1k inh.: **{centros}**")
+        col2.info   (f"🏘️ Most housing offers /1k inh.: **{viv}**")
+        col2.info   (f"💼 Most companies /1k inh.: **{emp}**")
+
+        # does the winner depend on the 40/30/30 weights? Monte Carlo over weight vectors
+        with st.expander("🎲 How robust is this ranking to the index weights?"):
+            col1, col2, col3 = st.columns(3)
+            n_muestras = col1.select_slider("Weight samples:", [500, 1000, 2000, 5000, 10000],
+                                            value=2000, key="n_muestras")
+            reparto = col2.radio("Sampled weights:", ["Around 40/30/30", "Any weighting"], key="reparto_pesos")
+            normalizar = col3.checkbox("Scale each ratio by its maximum", key="normalizar_ratios",
+                                       help="The index uses raw ratios, where companies per 1000 inh. dominate.")
+            estabilidad = cached_rank_stability(
+                dataset, nivel, n_muestras,
+                None if reparto == "Any weighting" else ROBUSTNESS_CONCENTRACION, normalizar)
+            p_mejor = estabilidad.win_share(seleccionados)
+            tabla_rangos = estabilidad.resumen.set_index("municipio").reindex(p_mejor.index).join(p_mejor)
+            st.dataframe(tabla_rangos.rename(columns={
+                "rango_base": "Rank (40/30/30)", "rango_p5": "Rank p5", "rango_mediana": "Median rank",
+                "rango_p95": "Rank p95", "p_top1": "P(1st overall)", "p_top10": "P(top 10)",
+                "p_mejor": "P(best of selection)"}))
+            st.plotly_chart(fig_rank_interval(tabla_rangos), use_container_width=True)
+
+        # static HTML (+ PNG/PDF with kaleido) bundle, cached per version and selection
+        clave_informe = (version, nivel, tuple(sorted(seleccionados)))
+        if st.button("📄 Export report", key="exportar_informe"):
+            st.session_state["informe"] = (clave_informe, submit_report(version, comparacion, nivel))
+        informe = st.session_state.get("informe")
+        if informe is not None and informe[0] == clave_informe:
+            futuro = informe[1]
+            if not futuro.done():
+                report_progress(futuro)
+            elif futuro.exception() is not None:
+                st.error(f"Report failed: {futuro.exception()}")
+            else:
+                try:
+                    with open(futuro.result(), "rb") as f:
+                        st.download_button("⬇️ Download report (.zip)", f.read(),
+                                           file_name="report.zip", mime="application/zip")
+                except FileNotFoundError:
+                    # evicted from REPORT_DIR since it was built
+                    del st.session_state["informe"]
+                    st.info("The report expired, export it again.")
+
+
+#  4. VISUALIZATION (indicator map)
+def indicator_map(dataset, series, serie_firma, map_style: str):
+    version = dataset.version
+    catalog = dataset.catalog
+    st.header("INDICATOR MAP")
+
+    # drill up/down: comarca and province roll-ups exist when the mapping file does
+    nivel = "municipio"
+    if len(dataset.niveles) > 1:
+        nivel = st.radio("Aggregation level:", list(dataset.niveles), horizontal=True, key="nivel_mapa")
+    df_nivel = dataset.niveles[nivel]
+    stats_nivel = catalog.indicadores if nivel == "municipio" else catalog.niveles[nivel]
+
+    # includes the distance-to-school indicators once the accessibility pipeline has run
+    indicador = st.selectbox("Select an indicator for the map", list(stats_nivel))
+
+    escala = st.radio("Colour scale:", ["Linear (max)", "Quantile"], horizontal=True)
+
+    # profile clusters, precomputed per dataset version
+    perfiles = False
+    if nivel == "municipio":
+        perfiles = st.checkbox("🧩 Colour by municipality profile (clusters)", key="ver_perfiles")
+
+    # choropleth from the municipal boundaries, when the GeoJSON is available
+    forma = "Points"
+    if nivel == "municipio" and dataset.geometrias:
+        forma = st.radio("Draw municipalities as:", ["Points", "Polygons"], horizontal=True)
+        if forma == "Polygons":
+            zoom_detalle = st.select_slider("Boundary detail (zoom level):",
+                                            list(dataset.geometrias), value=7)
+
+    # monthly extracts: one precomputed colour frame per period
+    evolucion = False
+    if (series is not None and nivel == "municipio" and forma == "Points" and not perfiles
+            and indicador in SERIES_COLUMNAS):
+        evolucion = st.checkbox("Show evolution over time")
+        if evolucion:
+            periodo = st.select_slider("Period:", series.periodos, value=series.periodos[-1])
+
+    if not all(col in df_nivel.columns for col in ["lat", "lon", indicador]):
+        st.error("Missing required columns to generate the map.")
+        return
+
+    stats = stats_nivel[indicador]
+    df_mapa = map_data(version, nivel, indicador, escala, df_nivel, stats)
+    min_val, max_val = stats.min, stats.max
+    fill_color = "fill_color" if escala == "Quantile" else linear_fill(indicador, max_val)
+
+    if evolucion:
+        df_mapa = series_frame(version, serie_firma, indicador, periodo, series, dataset.df)
+        fill_color = "fill_color"
+        # frames share one scale: the maximum over the whole series
+        min_val, max_val = 0.0, float(np.nanmax(series.valores[indicador]))
+
+    tooltip = "{" + nivel + "}\n" + indicador + ": {" + indicador + "}"
+    if perfiles:
+        df_mapa = cluster_map_data(version, indicador, escala, df_mapa, dataset.clusters)
+        fill_color = "cluster_color"
+        tooltip += "\nProfile: {perfil}"
+
+    if forma == "Polygons":
+        datos = map_polygons(version, zoom_detalle, indicador, escala, perfiles,
+                             dataset.geometrias[zoom_detalle], df_mapa)
+    else:
+        datos = df_mapa
+    layer = indicator_layer(datos, fill_color, nivel, poligonos=forma == "Polygons")
+    st.pydeck_chart(indicator_deck(layer, stats, tooltip, map_style))
+
+    if perfiles:
+        st.markdown(" ".join(
+            f"<span style='color:rgb({c[0]},{c[1]},{c[2]})'>●</span> {nombre}"
+            for nombre, c in zip(dataset.clusters.perfiles["nombre"], CLUSTER_PALETA)),
+            unsafe_allow_html=True)
+        st.dataframe(dataset.clusters.perfiles, hide_index=True)
+    else:
+        # the legend only depends on the data version and the selection; the
+        # evolution frames are coloured linearly against the series maximum
+        st.plotly_chart(pio.from_json(legend_json(
+            version, nivel, indicador, "Linear (max)" if evolucion else escala,
+            serie_firma if evolucion else None, min_val, max_val, stats)), use_container_width=True)
+
+
+#  5. MAP OF EDUCATIONAL CENTERS
+def schools_map(dataset):
+    version = dataset.version
+    centros_df = dataset.centros_df
+    df = dataset.df
+    st.header("MAP OF EDUCATIONAL CENTERS")
+
+    regimenes = centros_df["regimen"].dropna().unique().tolist()
+    regimen_seleccionado = st.selectbox("Select the center type:", sorted(regimenes))
+    regimen_stats = dataset.catalog.regimenes[regimen_seleccionado]
+
+    vista = st.radio(
+        "Select map detail level:",
+        ["📍 General view by municipality", "⬡ Density grid", "🔎 Detailed view by center"])
+
+    # ranked full-text search (name, type, locality); matches are highlighted on the map
+    col_q, col_cerca, col_radio = st.columns([3, 2, 1])
+    consulta_centro = col_q.text_input("🔎 Find a school (name, type or locality):", key="buscar_centro")
+    cerca_de = col_cerca.selectbox("Near:", ["Anywhere"] + sorted(df["municipio"].dropna()), key="cerca_de")
+    radio_km = col_radio.number_input("Radius (km):", 1, 100, 10, key="radio_busqueda")
+    solo_regimen = st.checkbox(f"Only '{regimen_seleccionado}' centers", key="solo_regimen")
+
+    encontrados = centros_df.iloc[:0]
+    if consulta_centro:
+        cerca = None
+        if cerca_de != "Anywhere":
+            fila = df[df["municipio"] == cerca_de].iloc[0]
+            cerca = (float(fila["lat"]), float(fila["lon"]), float(radio_km))
+        filtros = dict(regimenes=[regimen_seleccionado] if solo_regimen else None, cerca=cerca)
+        filas, _ = dataset.indice_centros.search(consulta_centro, 50, **filtros)
+        if not len(filas):
+            # no term matches (typos): fall back on the fuzzy name index
+            permitido = dataset.indice_centros.mask(**filtros)
+            filas = [i for i in dataset.buscador_centros.search(consulta_centro, 50) if permitido[i]]
+        encontrados = centros_df.iloc[filas]
+
+    # GENERAL view: circles + gradient
+    if vista == "📍 General view by municipality":
+        marcadores = markers_for(version, regimen_seleccionado,
+                                 cached_schools(dataset, regimen_seleccionado), regimen_stats)
+        layer = general_layer(marcadores)
+        tooltip = {"text": "{localidad}\nSchools: {n_centros}"}
+
+    # DENSITY view: hexagon cells precomputed per regimen and cell size
+    elif vista == "⬡ Density grid":
+        tam_celda = st.select_slider("Cell size (km):", options=sorted(DENSITY_RESOLUCIONES),
+                                     value=DENSITY_RESOLUCIONES[1], key="tam_celda")
+        layer = density_layer(dataset.densidad[regimen_seleccionado][tam_celda], tam_celda)
+        tooltip = {"text": "Schools in this cell: {n_centros}"}
+
+    # DETAILED view: individual centres
+    else:
+        layer = detail_layer(centros_filtrados(version, regimen_seleccionado, centros_df))
+        tooltip = {"text": "{DENOMINACION}\nType: {tipo}"}
+
+    capas = [layer]
+    if len(encontrados):
+        capas.append(highlight_layer(encontrados, pickable=vista == "🔎 Detailed view by center"))
+
+    st.pydeck_chart(schools_deck(capas, schools_view(regimen_stats, encontrados), tooltip))
+
+    # gradient legend (general view only)
+    if vista == "📍 General view by municipality":
+        st.plotly_chart(fig_colorbar(TRITONE_SCALE, regimen_stats.centros_por_localidad.min,
+                                     regimen_stats.centros_por_localidad.max, "Number of schools"),
+                        use_container_width=True)
+
+    if len(encontrados):
+        st.dataframe(encontrados[["DENOMINACION", "tipo", "regimen", "localidad"]], hide_index=True)
+    elif consulta_centro:
+        st.caption("No school matches that search.")
+
+
+#  6. SEARCH
+def search(dataset):
+    st.markdown("""
+        <div style="margin-top:0;">
+        <h2 style="margin:0;">
+            SEARCH BY MINIMUM CONDITIONS
+        </h2>
+        </div>
+        """, unsafe_allow_html=True)
+
+    min_centros = st.slider("Minimum educational centers per 1000 inhabitants:", 0.0, 10.0, 1.0)
+    min_viviendas = st.slider("Minimum housing per 1000 inhabitants:", 0.0, 10.0, 1.0)
+    min_empresas = st.slider("Minimum companies per 1000 inhabitants:", 0.0, 1000.0, 100.0)
+
+    max_dist = tope = max_dist_bound(dataset.catalog)
+    if tope is not None:
+        max_dist = st.slider("Maximum distance to the nearest school (km):", 0.0, tope, tope)
+
+    resultado = cached_search(dataset, min_centros, min_viviendas, min_empresas, max_dist)
+
+    # keep only some municipality profiles (clusters)
+    nombres_perfil = dataset.clusters.perfiles["nombre"].tolist()
+    perfiles_busqueda = st.multiselect("Municipality profiles:", nombres_perfil, key="perfiles_busqueda",
+                                       placeholder="All profiles")
+    if perfiles_busqueda:
+        asignacion = dataset.clusters.assignments()
+        elegidos = asignacion.loc[asignacion["perfil"].isin(perfiles_busqueda), "municipio"]
+        resultado = resultado[resultado["municipio"].isin(elegidos)]
+
+    st.dataframe(resultado)
+
+    if not resultado.empty:
+        st.success(f"{len(resultado)} cities meet your criteria.")
+
+
+#  7. PAGE
+def render(map_style: str = "road"):
+    """The whole app; ``map_style`` is the basemap of the indicator map."""
+    st.set_page_config(
+        page_title="Where to live in the Valencian Community?",
+        page_icon="🏠",
+        layout="wide"
+    )
+    # Static, cacheable stylesheet (static/styles.css) instead of an inline
+    # <style> block re-sent on every rerun; fonts and icons are self-hosted
+    st.markdown('<link rel="stylesheet" href="app/static/styles.css">', unsafe_allow_html=True)
+
+    # initialized once per process, shared by every session and entry point
+    dataset = runtime.current()
+    serie_firma, series = runtime.series()
+
+    with st.container():
+        st.markdown("""<h1 style='text-align:center; color:var(--primary);'> Where to live in the Valencian Community?
+                        </h1>""", unsafe_allow_html=True)
+
+        st.markdown("""<p style='text-align:center; font-size:22px; color:var(--gray-200);'>
+                Find the best place to live based on your needs and preferences.</p> """, unsafe_allow_html=True)
+
+    # Tabs with icons + text
+    tabs = st.tabs([
+        f" HOME",
+        f" COMPARATOR",
+        f" VISUALIZATION",
+        f" EDUCATIONAL CENTERS",
+        f" SEARCH"])
+
+    with tabs[0]:
+        home()
+    with tabs[1]:
+        comparator(dataset, series)
+    with tabs[2]:
+        indicator_map(dataset, series, serie_firma, map_style)
+    with tabs[3]:
+        schools_map(dataset)
+    with tabs[4]:
+        search(dataset)